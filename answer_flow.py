@@ -0,0 +1,105 @@
+from redraw import IdleRenderer
+
+
+def _ignore(*args):
+    pass
+
+
+class AnswerFlow:
+    """What answering a question does to the map, apart from the widgets.
+
+    answer() resets the zoom, colours the answered country, moves on to the
+    next question and highlights it. None of these steps draws: they mark
+    the IdleRenderer, so an answer draws the canvas once, on the next idle
+    cycle. The widgets are updated through the callbacks
+    show_outcome(country, correct, close), show_question(country) and
+    show_game_over(); before_render() and after_render() run around every
+    canvas draw. find_mode is set while the player answers by clicking, in
+    which case the current country is not highlighted.
+    """
+
+    def __init__(
+        self,
+        root,
+        canvas,
+        quiz,
+        map_layer,
+        view,
+        snapshot,
+        redraw_scheduler,
+        frame_stats,
+        show_outcome=_ignore,
+        show_question=_ignore,
+        show_game_over=_ignore,
+        before_render=_ignore,
+        after_render=_ignore,
+    ):
+        self.canvas = canvas
+        self.quiz = quiz
+        self.map_layer = map_layer
+        self.view = view
+        self.snapshot = snapshot
+        self.redraw_scheduler = redraw_scheduler
+        self.frame_stats = frame_stats
+        self.show_outcome = show_outcome
+        self.show_question = show_question
+        self.show_game_over = show_game_over
+        self.before_render = before_render
+        self.after_render = after_render
+        self.find_mode = False
+        self.renderer = IdleRenderer(root, self.render)
+
+    def start(self):
+        """Ask the first question and draw the map at once."""
+        self.next_question()
+        self.renderer.flush()
+
+    def submit(self, guess):
+        """Answer with a typed guess; an empty guess skips the question."""
+        if not self.quiz.finished:
+            self.answer(*self.quiz.answer(guess))
+
+    def answer_with(self, name):
+        """Answer with a country, e.g. the one clicked in find mode."""
+        if not self.quiz.finished:
+            self.answer(self.quiz.answer_with(name))
+
+    def answer(self, correct, close=False):
+        """Show the outcome for the current country (None if skipped) and move on.
+
+        close marks a guess that was a few typos away from the answer.
+        """
+        self.reset_zoom()
+        country = self.quiz.current
+        self.map_layer.set_state(country, "guessed" if correct else None)
+        self.show_outcome(country, correct, close)
+        self.next_question()
+
+    def next_question(self):
+        if self.quiz.next_question() is None:
+            self.show_game_over()
+            self.draw_map()
+            return
+        self.show_question(self.quiz.current)
+        self.draw_map(self.quiz.current)
+
+    def reset_zoom(self):
+        # A zoom or drag frame still pending would cover the full map again
+        self.redraw_scheduler.cancel()
+        self.view.reset()
+        self.renderer.mark("reset_map_zoom")
+
+    def draw_map(self, current_country=None):
+        if current_country and not self.find_mode:
+            self.map_layer.set_state(current_country, "current")
+        self.snapshot.invalidate()
+        self.renderer.mark("draw_map")
+
+    def render(self, reasons):
+        """Draw the map once for everything marked since the last render."""
+        self.snapshot.hide()
+        self.before_render()
+        self.frame_stats.time(
+            ",".join(reasons), self.canvas.draw, events=sum(reasons.values())
+        )
+        self.after_render()
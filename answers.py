@@ -0,0 +1,123 @@
+import unicodedata
+
+import pycountry
+
+from fuzzy import TrigramIndex
+from quiz import CLOSE, CORRECT, WRONG
+
+
+# Natural Earth columns holding other names for a country
+ALIAS_COLUMNS = ("NAME_LONG", "NAME_EN", "ABBREV")
+
+# Everyday names that neither Natural Earth nor pycountry list
+EXTRA_ALIASES = {
+    "United States of America": ("USA", "US", "United States", "America"),
+    "United Kingdom": ("UK", "Britain", "Great Britain"),
+    "United Arab Emirates": ("UAE",),
+    "Dem. Rep. Congo": ("DRC", "DR Congo", "Congo-Kinshasa"),
+    "Congo": ("Congo-Brazzaville",),
+}
+
+
+def normalize_answer(text):
+    """Reduce text to the form answers are compared in.
+
+    Casefolds, strips accents, drops punctuation (dashes become spaces),
+    collapses whitespace and drops a leading "the", so "Côte d’Ivoire",
+    "cote d'ivoire" and "COTE DIVOIRE" all compare equal.
+    """
+    text = unicodedata.normalize("NFKD", text.replace("&", " and ")).casefold()
+    chars = []
+    for char in text:
+        category = unicodedata.category(char)
+        if category == "Pd" or char.isspace():
+            chars.append(" ")
+        elif category[0] not in "MPS":
+            chars.append(char)
+    words = "".join(chars).split()
+    if words[:1] == ["the"]:
+        words = words[1:]
+    return " ".join(words)
+
+
+def _pycountry_names(alpha_2):
+    country = pycountry.countries.get(alpha_2=alpha_2.upper())
+    if country is None:
+        return []
+    names = [
+        getattr(country, field, None)
+        for field in ("name", "official_name", "common_name")
+    ]
+    names = [name for name in names if name]
+    # "Korea, Republic of" is also typed as "Republic of Korea"
+    for name in list(names):
+        head, sep, tail = name.partition(", ")
+        if sep:
+            names.append(f"{tail} {head}")
+    return names
+
+
+class AnswerIndex:
+    """Accepted spellings for every country, normalized once at load time.
+
+    Spellings come from NAME, the ALIAS_COLUMNS the layer has, the pycountry
+    names for the country's ISO code and EXTRA_ALIASES. Checking a guess is
+    one normalize_answer() call and one set lookup; only guesses that match
+    no spelling at all go on to a trigram search for near misses.
+    """
+
+    def __init__(self, world, alpha2_table):
+        columns = ["NAME", *(c for c in ALIAS_COLUMNS if c in world.columns)]
+        # (spelling, name) pairs as written, e.g. for autocomplete
+        self.spellings = []
+        for row in world[columns].itertuples(index=False):
+            name = row[0]
+            if not isinstance(name, str):
+                continue
+            self.spellings.extend(
+                (value, name) for value in row if isinstance(value, str) and value
+            )
+            if name in alpha2_table:
+                self.spellings.extend(
+                    (value, name) for value in _pycountry_names(alpha2_table[name])
+                )
+            self.spellings.extend(
+                (value, name) for value in EXTRA_ALIASES.get(name, ())
+            )
+        self.spellings = list(dict.fromkeys(self.spellings))
+
+        self._accepted = {}
+        # Every normalized spelling -> the countries it names
+        self._names_by_key = {}
+        for spelling, name in self.spellings:
+            key = normalize_answer(spelling)
+            if key:
+                self._accepted.setdefault(name, set()).add(key)
+                self._names_by_key.setdefault(key, set()).add(name)
+        self._near = TrigramIndex(self._names_by_key)
+
+    def accepted(self, name):
+        """Return the normalized spellings accepted for name."""
+        return self._accepted.get(name, set())
+
+    def check(self, guess, name, max_typos=0):
+        """Return CORRECT, CLOSE or WRONG for guess as an answer for name.
+
+        CLOSE means the nearest spellings, at most max_typos edits away,
+        include one of name's. Short guesses allow fewer edits (one per four
+        characters), and a guess that spells another country exactly is
+        WRONG however close it is.
+        """
+        key = normalize_answer(guess)
+        if key in self.accepted(name):
+            return CORRECT
+        if not key or key in self._names_by_key:
+            return WRONG
+        matches = self._near.search(key, min(max_typos, len(key) // 4))
+        if any(
+            name in self._names_by_key[match]
+            for distance, match in matches
+            if distance == matches[0][0]
+        ):
+            return CLOSE
+        return WRONG
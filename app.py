@@ -0,0 +1,577 @@
+"""The quiz window, built by run() once main.py has loaded the data."""
+
+import matplotlib.pyplot as plt
+import tkinter as tk
+import tkinter.ttk as ttk
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+import signal
+import sys
+from PIL import ImageTk
+
+import config
+import startup
+from answer_flow import AnswerFlow
+from frame_stats import FrameStats
+from flags import FlagPrefetcher, placeholder_flag
+from hover import HoverOutline
+from map_layer import MapLayer
+from map_view import MapView
+from quiz import QuizEngine
+from redraw import RedrawScheduler
+from snapshot import MapSnapshot
+
+
+# Quiz
+MAX_TYPOS = config.get("quiz", "max_typos", 2)
+
+# Widgets
+COMMON_FONT = ("Segoe UI", 16)
+COMMON_BG = "#f5f5f5"
+COMMON_PAD = 8
+SUGGESTION_LIMIT = 8
+
+# Map interaction
+SETTLE_MS = config.get("map", "settle_ms", 150)
+CLICK_SLOP_PX = 3
+
+# Polling intervals of the Tk loop
+FLAG_POLL_MS = 50
+LOD_POLL_MS = 100
+HUD_REFRESH_MS = 250
+
+
+def run(root, data, options):
+    """Build the quiz in root and run the Tk loop until the window closes.
+
+    data is what startup.load() returned and options the parsed command line
+    of main.py.
+    """
+    # --- World map, loaded by main.py while the window was already up ---
+    world = data["world"]
+    countries = data["countries"]
+    country_codes = data["country_codes"]
+    answer_index = data["answer_index"]
+    name_index = data["name_index"]
+    quiz = QuizEngine(
+        countries,
+        check=lambda guess, name: answer_index.check(guess, name, MAX_TYPOS),
+        seed=config.get("quiz", "seed", None),
+        accept_close=config.get("quiz", "accept_typos", True),
+    )
+
+    minx, miny, maxx, maxy = world.total_bounds
+
+    default_xlim = (minx, maxx)
+    default_ylim = (miny, maxy)
+
+    # --- Tkinter setup ---
+    style = ttk.Style()
+    style.theme_use("clam")
+    style.configure("TFrame", background=COMMON_BG)
+    style.configure(
+        "TLabel",
+        background=COMMON_BG,
+        foreground="#222",
+        font=COMMON_FONT,
+        padding=COMMON_PAD,
+    )
+    style.configure("TButton", font=COMMON_FONT, padding=COMMON_PAD)
+    style.configure("TEntry", font=COMMON_FONT, padding=COMMON_PAD)
+
+    # --- Flags are downloaded in the background before they are needed ---
+    flag_prefetcher = FlagPrefetcher(country_codes)
+
+    # --- Handle Ctrl+C and window close instantly ---
+    def _exit_on_sigint():
+        flag_prefetcher.shutdown()
+        detail_levels.shutdown()
+        frame_stats.close()
+        root.destroy()
+        sys.exit(0)
+
+    signal.signal(signal.SIGINT, _exit_on_sigint)
+
+    def _exit_on_close():
+        flag_prefetcher.shutdown()
+        detail_levels.shutdown()
+        frame_stats.close()
+        root.destroy()
+        sys.exit(0)
+
+    root.protocol("WM_DELETE_WINDOW", _exit_on_close)
+
+    # --- Matplotlib figure inside Tkinter ---
+    fig, ax = plt.subplots(figsize=(12, 6))
+    fig.subplots_adjust(left=0, right=1, top=1, bottom=0)
+
+    # Set default zoom to fit the map to the window width
+    ax.set_xlim(minx, maxx)
+    ax.set_ylim(miny, maxy)
+    ax.set_aspect("equal")
+    ax.axis("off")
+    ax.autoscale(False)
+    ax.margins(0)
+    fig.patch.set_facecolor("#b3d1ff")
+
+    # Map paths per Natural Earth scale and simplification tolerance
+    detail_levels = data["detail_levels"]
+    current_detail_key = detail_levels.base_key
+
+    # Draw country borders and prebuilt highlight patches once
+    map_layer = MapLayer(ax, detail_levels.base_paths)
+    map_view = MapView(ax, default_xlim, default_ylim)
+
+    # --- Layout: map and controls in separate columns ---
+    main_frame = ttk.Frame(root)
+    main_frame.pack(fill=tk.BOTH, expand=1)
+
+    # Left column: map
+    map_frame = ttk.Frame(main_frame)
+    map_frame.grid(row=0, column=0, sticky="nsew")
+    main_frame.columnconfigure(0, weight=3)
+    main_frame.rowconfigure(0, weight=1)
+
+    canvas = FigureCanvasTkAgg(fig, master=map_frame)
+    canvas.get_tk_widget().pack(fill=tk.BOTH, expand=1, padx=0, pady=0)
+
+    # Raster stand-in for the map while panning and zooming
+    snapshot = MapSnapshot(
+        canvas.get_tk_widget(),
+        ax,
+        (*default_xlim, *default_ylim),
+        scale=config.get("map", "snapshot_scale", 2),
+    )
+
+    # One redraw per frame, however many mouse events arrive in between
+    redraw_scheduler = RedrawScheduler(root, max_fps=config.get("map", "max_fps", 60))
+
+    # Draw timings for the optional performance HUD and CSV trace
+    frame_stats = FrameStats(trace_path=options.perf_trace)
+    hud_label = None
+    if options.perf_hud:
+        hud_label = tk.Label(
+            map_frame, font=("Consolas", 11), bg="black", fg="lime", justify=tk.LEFT
+        )
+        hud_label.place(x=8, y=8)
+
+    # Right column: controls (fixed width)
+    controls_frame = ttk.Frame(main_frame, width=300)
+    controls_frame.grid(row=0, column=1, sticky="ns", padx=10, pady=10)
+    main_frame.columnconfigure(1, weight=0)  # Prevent stretching
+
+    controls_frame.pack_propagate(False)  # Prevent shrinking when window is resized
+
+    feedback_label = ttk.Label(controls_frame, text="Which country is highlighted?")
+    feedback_label.pack(side=tk.TOP, pady=8, anchor="center")
+
+    entry_frame = ttk.Frame(controls_frame)
+    entry_frame.pack(side=tk.TOP, fill=tk.X, pady=0)
+
+    entry = ttk.Entry(entry_frame, font=COMMON_FONT)
+    entry.pack(side=tk.TOP, fill=tk.X, expand=1, padx=0, ipady=0)
+
+    # Suggestions shown under the entry while typing
+    suggestion_list = tk.Listbox(
+        entry_frame, font=COMMON_FONT, height=SUGGESTION_LIMIT, activestyle="none"
+    )
+
+    def hide_suggestions():
+        suggestion_list.pack_forget()
+
+    def update_suggestions():
+        matches = name_index.complete(entry.get(), limit=SUGGESTION_LIMIT)
+        if not matches:
+            hide_suggestions()
+            return
+        suggestion_list.delete(0, tk.END)
+        suggestion_list.insert(tk.END, *matches)
+        suggestion_list.config(height=len(matches))
+        if not suggestion_list.winfo_ismapped():
+            suggestion_list.pack(side=tk.TOP, fill=tk.X, after=entry)
+
+    def on_entry_key_release(event):
+        if event.keysym not in ("Return", "Escape", "Up", "Down", "Tab"):
+            update_suggestions()
+
+    def on_entry_down(event):
+        if suggestion_list.winfo_ismapped():
+            suggestion_list.focus_set()
+            suggestion_list.selection_clear(0, tk.END)
+            suggestion_list.selection_set(0)
+            suggestion_list.activate(0)
+        return "break"
+
+    def accept_suggestion(event=None):
+        selection = suggestion_list.curselection()
+        if selection:
+            entry.delete(0, tk.END)
+            entry.insert(0, suggestion_list.get(selection[0]))
+        hide_suggestions()
+        entry.focus_set()
+        entry.icursor(tk.END)
+        return "break"
+
+    def close_suggestions(event=None):
+        hide_suggestions()
+        entry.focus_set()
+        return "break"
+
+    def on_suggestion_up(event):
+        if suggestion_list.curselection() == (0,):
+            return close_suggestions()
+
+    entry.bind("<KeyRelease>", on_entry_key_release)
+    entry.bind("<Down>", on_entry_down)
+    entry.bind("<Escape>", close_suggestions)
+    suggestion_list.bind("<Return>", accept_suggestion)
+    suggestion_list.bind("<Double-Button-1>", accept_suggestion)
+    suggestion_list.bind("<Up>", on_suggestion_up)
+    suggestion_list.bind("<Escape>", close_suggestions)
+
+    def submit_guess(event=None):
+        guess = entry.get()
+        entry.delete(0, tk.END)
+        hide_suggestions()
+        answer_flow.submit(guess)
+
+    def show_outcome(last_country, correct, close):
+        """Show the result for the country just asked (correct is None if skipped).
+
+        close marks a guess that was a few typos away from the answer.
+        """
+        show_flag(last_country)
+        last_country_label.config(text=last_country)
+
+        if correct is None:
+            attempt_result_label.config(text="Skipped", foreground="orange")
+            feedback_label.config(
+                text=f"Skipped! It was {last_country}.", foreground="orange"
+            )
+        elif correct:
+            verdict = "Close enough" if close else "Correct"
+            attempt_result_label.config(text=verdict, foreground="green")
+            feedback_label.config(
+                text=f"{verdict}! It was {last_country}.", foreground="green"
+            )
+        else:
+            verdict = "Close" if close else "Wrong"
+            attempt_result_label.config(text=verdict, foreground="red")
+            feedback_label.config(
+                text=f"{verdict}! It was {last_country}.", foreground="red"
+            )
+
+    def show_question(country):
+        flag_prefetcher.prefetch(country)
+        update_question_label()
+
+    submit_button = ttk.Button(entry_frame, text="Submit", command=submit_guess)
+    submit_button.pack(side=tk.TOP, fill=tk.X, expand=1, pady=(10, 0))
+
+    entry.bind("<Return>", submit_guess)
+
+    # --- Find mode: the app names a country and the player clicks it ---
+    find_mode = tk.BooleanVar(value=False)
+
+    def update_question_label():
+        if find_mode.get():
+            question_label.config(text=f"Find: {quiz.current}")
+        else:
+            question_label.config(text="")
+
+    def on_find_mode_change():
+        state = tk.DISABLED if find_mode.get() else tk.NORMAL
+        entry.config(state=state)
+        submit_button.config(state=state)
+        answer_flow.find_mode = find_mode.get()
+        if find_mode.get():
+            map_layer.set_state(quiz.current, None)
+        update_question_label()
+        answer_flow.draw_map(quiz.current)
+
+    find_mode_button = ttk.Checkbutton(
+        controls_frame,
+        text="Find on map",
+        variable=find_mode,
+        command=on_find_mode_change,
+    )
+    find_mode_button.pack(side=tk.TOP, pady=(10, 0), anchor="w")
+
+    question_label = ttk.Label(controls_frame, text="")
+    question_label.pack(side=tk.TOP, pady=(0, 5), anchor="center")
+
+    # --- Helper functions ---
+    _awaited_flag = None
+
+    def show_flag(country_name):
+        """Show the flag if it has been prefetched, otherwise a placeholder until it arrives."""
+        nonlocal _awaited_flag
+        flag_img = flag_prefetcher.get(country_name)
+        if flag_img is None:
+            _awaited_flag = country_name
+            flag_img = placeholder_flag()
+        else:
+            _awaited_flag = None
+        flag_photo = ImageTk.PhotoImage(flag_img)
+        flag_label.config(image=flag_photo)
+        flag_label.image = flag_photo
+
+    def poll_flags():
+        arrived = flag_prefetcher.poll()
+        if _awaited_flag in arrived:
+            show_flag(_awaited_flag)
+        root.after(FLAG_POLL_MS, poll_flags)
+
+    def update_counter():
+        root.title(f"World Countries Quiz ({quiz.score}/{quiz.total})")
+
+    def apply_detail_level():
+        """Switch to the scale and simplification for the current zoom, once loaded."""
+        nonlocal current_detail_key
+        x0, x1 = ax.get_xlim()
+        key = detail_levels.key_for(
+            ax.bbox.width / (x1 - x0), full_view=not map_view.zoomed
+        )
+        if key == current_detail_key:
+            return
+        paths = detail_levels.get(key)
+        if paths is not None:
+            map_layer.set_paths(paths)
+            hover_outline.set_locator(detail_levels.locator_for(key))
+            current_detail_key = key
+
+    def poll_detail_levels():
+        if detail_levels.poll() and not snapshot.active:
+            redraw_scheduler.request(redraw_full_map)
+        root.after(LOD_POLL_MS, poll_detail_levels)
+
+    def end_game():
+        question_label.config(text="")
+        find_mode_button.config(state=tk.DISABLED)
+        feedback_label.config(
+            text=f"Game over! You guessed {quiz.score} countries correctly.",
+            foreground="blue",  # ttk uses 'foreground'
+        )
+        submit_button.config(state=tk.DISABLED)
+        entry.config(state=tk.DISABLED)
+
+    # Answers only mark the map dirty; it is drawn once per Tk idle cycle
+    answer_flow = AnswerFlow(
+        root,
+        canvas,
+        quiz,
+        map_layer,
+        map_view,
+        snapshot,
+        redraw_scheduler,
+        frame_stats,
+        show_outcome=show_outcome,
+        show_question=show_question,
+        show_game_over=end_game,
+        before_render=apply_detail_level,
+        after_render=update_counter,
+    )
+
+    # Pick first random country
+    with startup.profile.stage("first draw"):
+        answer_flow.start()
+
+    # --- Mouse wheel zoom at cursor position ---
+    def on_mouse_wheel(event):
+        widget = canvas.get_tk_widget()
+        # Only zoom if the mouse is over the map canvas and this is a real scroll event
+        if widget.winfo_containing(event.x_root, event.y_root) == widget:
+            x_pixel = event.x
+            y_pixel = event.y
+
+            inv = ax.transData.inverted()
+            xdata, ydata = inv.transform((x_pixel, y_pixel))
+
+            # Only zoom once per event
+            if hasattr(event, "delta"):
+                factor = 0.8 if event.delta > 0 else 1.25
+            elif hasattr(event, "num"):
+                factor = 0.8 if event.num == 4 else 1.25
+            else:
+                factor = 1.0
+
+            zoom(factor, center=(xdata, ydata))
+
+    # Bind mouse wheel to zoom at cursor
+    canvas.get_tk_widget().bind("<MouseWheel>", on_mouse_wheel)  # Windows/macOS
+    canvas.get_tk_widget().bind("<Button-4>", on_mouse_wheel)  # Linux scroll up
+    canvas.get_tk_widget().bind("<Button-5>", on_mouse_wheel)  # Linux scroll down
+
+    # --- Drag to pan functionality ---
+    _drag_data = {"x": None, "y": None, "xlim": None, "ylim": None, "dragging": False}
+    _press_pos = None
+
+    def on_mouse_press(event):
+        nonlocal _press_pos
+        _press_pos = (event.x, event.y)
+        # Only start drag if left mouse button and not zoomed out to default
+        if event.num == 1 or (hasattr(event, "button") and event.button == 1):
+            # Only allow drag if zoomed in
+            if map_view.zoomed:
+                _drag_data["x"] = event.x
+                _drag_data["y"] = event.y
+                _drag_data["xlim"] = ax.get_xlim()
+                _drag_data["ylim"] = ax.get_ylim()
+                _drag_data["dragging"] = True
+
+    def on_mouse_release(event):
+        _drag_data["dragging"] = False
+        settle_interaction()
+        # A press and release in (almost) the same spot is a click, not a drag
+        if (
+            find_mode.get()
+            and _press_pos is not None
+            and abs(event.x - _press_pos[0]) <= CLICK_SLOP_PX
+            and abs(event.y - _press_pos[1]) <= CLICK_SLOP_PX
+        ):
+            on_map_click(event)
+
+    def on_map_click(event):
+        """In find mode, answer with the country under the cursor."""
+        # Tk counts pixels from the top, matplotlib from the bottom
+        inv = ax.transData.inverted()
+        xdata, ydata = inv.transform((event.x, fig.bbox.height - event.y))
+        locator = detail_levels.locator_for(current_detail_key)
+        clicked = locator.locate(xdata, ydata)
+        if clicked is not None:
+            answer_flow.answer_with(clicked)
+
+    def on_mouse_motion(event):
+        if _drag_data["dragging"]:
+            # Convert pixel movement to data coordinates
+            inv = ax.transData.inverted()
+            x0, y0 = inv.transform((_drag_data["x"], _drag_data["y"]))
+            x1, y1 = inv.transform((event.x, event.y))
+            delta_x = x0 - x1
+            delta_y = y1 - y0  # REVERSED vertical direction
+            map_view.pan(_drag_data["xlim"], _drag_data["ylim"], delta_x, delta_y)
+            redraw_scheduler.request(show_drag_frame)
+
+    # Bind mouse events for drag-to-pan
+    canvas.get_tk_widget().bind("<ButtonPress-1>", on_mouse_press)
+    canvas.get_tk_widget().bind("<ButtonRelease-1>", on_mouse_release)
+    canvas.get_tk_widget().bind("<B1-Motion>", on_mouse_motion)
+
+    # --- Switch back to the vector map once panning/zooming stops ---
+    _settle_job = None
+
+    def redraw_full_map():
+        answer_flow.renderer.mark("settle")
+
+    def show_drag_frame():
+        frame_stats.time(
+            "on_mouse_motion", snapshot.show, events=redraw_scheduler.batch
+        )
+
+    def show_zoom_frame():
+        frame_stats.time("zoom", snapshot.show, events=redraw_scheduler.batch)
+
+    def settle_interaction():
+        nonlocal _settle_job
+        if _settle_job is not None:
+            root.after_cancel(_settle_job)
+            _settle_job = None
+        if _drag_data["dragging"]:
+            return
+        if snapshot.active or redraw_scheduler.pending:
+            redraw_scheduler.request(redraw_full_map)
+
+    def schedule_settle():
+        nonlocal _settle_job
+        if _settle_job is not None:
+            root.after_cancel(_settle_job)
+        _settle_job = root.after(SETTLE_MS, settle_interaction)
+
+    # --- Add this zoom function ---
+    def zoom(factor, center=None):
+        map_view.zoom(factor, center)
+        redraw_scheduler.request(show_zoom_frame)
+        schedule_settle()
+
+    # --- Hover: outline the country under the cursor ---
+    hover_outline = HoverOutline(
+        canvas, ax, map_layer, detail_levels.locator_for(current_detail_key)
+    )
+    hover_mode = tk.BooleanVar(value=False)
+    # Spatial queries and blits are throttled like redraws
+    hover_scheduler = RedrawScheduler(root, max_fps=config.get("map", "hover_fps", 30))
+    _hover_pos = None
+
+    def update_hover():
+        if snapshot.active:
+            return
+        if _hover_pos is None or not hover_mode.get():
+            hover_outline.hover(None, None)
+            return
+        inv = ax.transData.inverted()
+        xdata, ydata = inv.transform((_hover_pos[0], fig.bbox.height - _hover_pos[1]))
+        hover_outline.hover(xdata, ydata)
+
+    def on_hover_motion(event):
+        nonlocal _hover_pos
+        if hover_mode.get():
+            _hover_pos = (event.x, event.y)
+            hover_scheduler.request(update_hover)
+
+    def on_hover_leave(event):
+        nonlocal _hover_pos
+        _hover_pos = None
+        hover_scheduler.request(update_hover)
+
+    canvas.get_tk_widget().bind("<Motion>", on_hover_motion, add="+")
+    canvas.get_tk_widget().bind("<Leave>", on_hover_leave, add="+")
+
+    hover_mode_button = ttk.Checkbutton(
+        controls_frame,
+        text="Outline country under cursor",
+        variable=hover_mode,
+        command=update_hover,
+    )
+    hover_mode_button.pack(side=tk.TOP, pady=(0, 5), anchor="w")
+
+    # --- Result display area ---
+    divider = ttk.Separator(controls_frame, orient="horizontal")
+    divider.pack(side=tk.TOP, fill=tk.X, pady=10)
+
+    result_frame = ttk.Frame(controls_frame)
+    result_frame.pack(side=tk.TOP, fill=tk.X, pady=5)
+
+    last_country_label = ttk.Label(result_frame, text="")
+    last_country_label.pack(side=tk.TOP, pady=(0, 5))
+
+    flag_label = ttk.Label(result_frame)
+    flag_label.pack(side=tk.TOP, pady=(0, 5))
+
+    attempt_result_label = ttk.Label(result_frame, text="")
+    attempt_result_label.pack(side=tk.TOP, pady=(0, 5))
+
+    # --- Performance HUD ---
+    def update_hud():
+        stats = frame_stats.summary()
+        schedulers = (redraw_scheduler, hover_scheduler)
+        pending = sum(scheduler.waiting for scheduler in schedulers)
+        merged = sum(scheduler.merged for scheduler in schedulers)
+        requests = sum(scheduler.requests for scheduler in schedulers)
+        hud_label.config(
+            text=(
+                f"draw p50 {stats['p50']:5.1f} ms  p95 {stats['p95']:5.1f} ms"
+                f"  max {stats['max']:5.1f} ms\n"
+                f"{stats['per_second']:3d} draws/s  {pending} pending events"
+                f"  {merged}/{requests} merged\n"
+                f"{map_layer.drawn} countries drawn, {map_layer.culled} culled"
+            )
+        )
+        root.after(HUD_REFRESH_MS, update_hud)
+
+    # --- Start Tkinter loop ---
+    root.after(FLAG_POLL_MS, poll_flags)
+    root.after(LOD_POLL_MS, poll_detail_levels)
+    if hud_label is not None:
+        root.after(HUD_REFRESH_MS, update_hud)
+    if startup.profile.enabled:
+        root.after_idle(startup.profile.report)
+    root.mainloop()
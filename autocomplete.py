@@ -0,0 +1,55 @@
+import bisect
+
+
+class PrefixIndex:
+    """Country names looked up by the start of any word of their spellings.
+
+    Keys live in sorted lists, so the matches for a prefix are the
+    contiguous run starting at a binary search; a keystroke never scans all
+    names. spellings is an iterable of (spelling, name) pairs, which lets
+    aliases point at the name they stand for. Matches on a name itself come
+    before matches on its aliases (e.g. official names), and within each,
+    spellings that start with the prefix come before those where a later
+    word does.
+    """
+
+    def __init__(self, spellings, normalize=str.casefold):
+        self.normalize = normalize
+        name_starts, name_words_after = set(), set()
+        alias_starts, alias_words_after = set(), set()
+        for spelling, name in spellings:
+            words = normalize(spelling).split()
+            if words == normalize(name).split():
+                starts, words_after = name_starts, name_words_after
+            else:
+                starts, words_after = alias_starts, alias_words_after
+            if words:
+                starts.add((" ".join(words), name))
+            for i in range(1, len(words)):
+                words_after.add((" ".join(words[i:]), name))
+        self._runs = [
+            sorted(entries)
+            for entries in (
+                name_starts,
+                name_words_after,
+                alias_starts,
+                alias_words_after,
+            )
+        ]
+
+    def complete(self, prefix, limit=8):
+        """Return up to limit names with a spelling that starts with prefix."""
+        prefix = " ".join(self.normalize(prefix).split())
+        if not prefix:
+            return []
+        matches = {}
+        for entries in self._runs:
+            i = bisect.bisect_left(entries, (prefix,))
+            while (
+                i < len(entries)
+                and len(matches) < limit
+                and entries[i][0].startswith(prefix)
+            ):
+                matches.setdefault(entries[i][1], None)
+                i += 1
+        return list(matches)
@@ -0,0 +1,31 @@
+"""Time a full map redraw against the number of guessed countries.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_draw_map [path/to/world.geojson]
+"""
+
+import argparse
+
+from benchmarks.suite import bench_draw_map, make_map
+from world_data import BUNDLED_WORLD_PATH, read_geojson
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("src", nargs="?", default=BUNDLED_WORLD_PATH)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    world = read_geojson(args.src)
+    fig, map_layer = make_map(world)
+    counts = (0, 25, 50, 100)
+    results = bench_draw_map(fig, map_layer, args.repeat, counts=counts)
+
+    print(f"{'guessed':>8}  {'draw (ms)':>10}")
+    for count, result in zip((*counts, len(map_layer.paths)), results.values()):
+        print(f"{count:>8}  {result['median_ms']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
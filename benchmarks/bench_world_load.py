@@ -0,0 +1,32 @@
+"""Compare loading the world layer from GeoJSON and from Feather.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_world_load [path/to/world.geojson]
+"""
+
+import argparse
+import tempfile
+
+from benchmarks.suite import bench_world_load
+from world_data import BUNDLED_WORLD_PATH
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("src", nargs="?", default=BUNDLED_WORLD_PATH)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = bench_world_load(args.src, args.repeat, tmp)
+    geojson_ms = results["world_load_geojson"]["median_ms"]
+    feather_ms = results["world_load_feather"]["median_ms"]
+
+    print(f"GeoJSON:    {geojson_ms:8.1f} ms")
+    print(f"Feather:    {feather_ms:8.1f} ms")
+    print(f"Speedup:    {geojson_ms / feather_ms:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
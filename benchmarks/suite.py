@@ -0,0 +1,324 @@
+"""Benchmark the startup and interaction hot paths and write the results as JSON.
+
+Runs headless (Agg backend) against the bundled copy of the 110m world
+layer, and serves flags from a local stub server, so no network is needed
+and results can be compared across commits. Run from the repository root:
+
+    python -m benchmarks.suite [--repeat N] [--output results.json]
+
+The Tk handlers in app.py can't run without a display, so each case calls
+the code they delegate to: draw_map() is a full canvas draw, and a zoom or
+drag frame is MapView.zoom() or MapView.pan() plus the snapshot crop that
+MapSnapshot.show() pastes. submit_guess() is AnswerFlow.submit() with the
+real answer index, and answer_render the same up to the one canvas draw it
+causes (tests/test_answer_flow.py checks that it is only one).
+"""
+
+import argparse
+import http.server
+import io
+import json
+import platform
+import statistics
+import subprocess
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt  # noqa: E402
+from PIL import Image  # noqa: E402
+
+import config  # noqa: E402
+import flags  # noqa: E402
+from answers import AnswerIndex  # noqa: E402
+from answer_flow import AnswerFlow  # noqa: E402
+from country_codes import build_alpha2_table  # noqa: E402
+from frame_stats import FrameStats  # noqa: E402
+from map_layer import MapLayer, build_country_paths  # noqa: E402
+from map_view import MapView  # noqa: E402
+from quiz import QuizEngine, exact_match  # noqa: E402
+from redraw import ManualLoop, RedrawScheduler  # noqa: E402
+from snapshot import MapSnapshot  # noqa: E402
+from world_data import (  # noqa: E402
+    BUNDLED_WORLD_PATH,
+    build_geometry_index,
+    convert_world,
+    read_columnar_world,
+    read_geojson,
+)
+
+
+def make_map(world):
+    """Build a map figure the way app.py does, at 1920x1080 pixels."""
+    fig, ax = plt.subplots(figsize=(19.2, 10.8), dpi=100)
+    fig.subplots_adjust(left=0, right=1, top=1, bottom=0)
+    minx, miny, maxx, maxy = world.total_bounds
+    ax.set_xlim(minx, maxx)
+    ax.set_ylim(miny, maxy)
+    ax.set_aspect("equal")
+    ax.axis("off")
+    ax.autoscale(False)
+    ax.margins(0)
+    map_layer = MapLayer(ax, build_country_paths(build_geometry_index(world)))
+    return fig, map_layer
+
+
+def _timings(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return _summary(timings)
+
+
+def _summary(timings):
+    timings = sorted(timings)
+    return {
+        "median_ms": statistics.median(timings) * 1000,
+        "p95_ms": timings[min(len(timings) - 1, int(len(timings) * 0.95))] * 1000,
+        "min_ms": timings[0] * 1000,
+        "runs": len(timings),
+    }
+
+
+def bench_world_load(src, repeat, tmp):
+    feather_path = Path(tmp) / "world.feather"
+    convert_world(src, feather_path)
+    return {
+        "world_load_geojson": _timings(lambda: read_geojson(src), repeat),
+        "world_load_feather": _timings(
+            lambda: read_columnar_world(feather_path), repeat
+        ),
+    }
+
+
+def bench_draw_map(fig, map_layer, repeat, counts=(0, 50)):
+    """Time full redraws with the first counts countries guessed, then all."""
+    names = list(map_layer.paths)
+    results = {}
+    for count in (*counts, len(names)):
+        map_layer.clear()
+        for name in names[:count]:
+            map_layer.set_state(name, "guessed")
+        key = "all" if count == len(names) else count
+        results[f"draw_map_{key}_guessed"] = _timings(fig.canvas.draw, repeat)
+    map_layer.clear()
+    return results
+
+
+def bench_zoom_and_drag(fig, map_layer, repeat):
+    ax = map_layer.ax
+    view = MapView(ax, ax.get_xlim(), ax.get_ylim())
+    snapshot = MapSnapshot(
+        None,
+        ax,
+        (*view.default_xlim, *view.default_ylim),
+        scale=config.get("map", "snapshot_scale", 2),
+    )
+    x0, y0, width, height = ax.bbox.bounds
+    size = (round(width), round(height))
+    snapshot.view_image(size)  # render the raster once, as the first frame does
+
+    # Zoom in step by step towards Europe, one wheel event per frame
+    zoom_steps = 10
+
+    def zoom():
+        view.reset()
+        for _ in range(zoom_steps):
+            view.zoom(0.9, center=(10, 50))
+            snapshot.view_image(size)
+
+    # Drag a view zoomed in 2x from the west to the east edge of the map,
+    # one motion event per frame
+    view.reset()
+    view.zoom(0.5, center=(view.default_xlim[0], 0))
+    start_xlim, start_ylim = ax.get_xlim(), ax.get_ylim()
+    x_range = view.default_xlim[1] - view.default_xlim[0]
+    drag_steps = range(0, round(x_range / 2), 2)
+
+    def drag():
+        for dx in drag_steps:
+            view.pan(start_xlim, start_ylim, dx, 0)
+            snapshot.view_image(size)
+
+    zoom_frames = _timings(zoom, repeat)
+    drag_frames = _timings(drag, repeat)
+    for result, frames in ((zoom_frames, zoom_steps), (drag_frames, len(drag_steps))):
+        result["frames"] = frames
+        result["median_ms_per_frame"] = result["median_ms"] / frames
+
+    # The full redraw once the interaction settles
+    zoom()
+    settle = _timings(fig.canvas.draw, repeat)
+    view.reset()
+    return {"zoom": zoom_frames, "drag": drag_frames, "zoom_settle_redraw": settle}
+
+
+def _answer_flow(fig, map_layer, idle, seed, check=exact_match):
+    ax = map_layer.ax
+    view = MapView(ax, ax.get_xlim(), ax.get_ylim())
+    flow = AnswerFlow(
+        idle,
+        fig.canvas,
+        QuizEngine(map_layer.paths, check=check, seed=seed),
+        map_layer,
+        view,
+        MapSnapshot(None, ax, (*view.default_xlim, *view.default_ylim)),
+        RedrawScheduler(idle),
+        FrameStats(),
+    )
+    flow.start()
+    return flow
+
+
+def bench_answer_render(fig, map_layer, repeat):
+    """Answer through AnswerFlow, as submit_guess() does, and count the renders."""
+    idle = ManualLoop()
+    flow = _answer_flow(fig, map_layer, idle, seed=0)
+    timings = []
+    renders = []
+    for i in range(repeat):
+        if flow.quiz.finished:
+            map_layer.clear()
+            flow = _answer_flow(fig, map_layer, idle, seed=i)
+        before = flow.renderer.renders
+        start = time.perf_counter()
+        flow.submit(flow.quiz.current)
+        idle.run()
+        timings.append(time.perf_counter() - start)
+        renders.append(flow.renderer.renders - before)
+    map_layer.clear()
+
+    result = _summary(timings)
+    result["renders_per_answer"] = max(renders)
+    return {"answer_render": result}
+
+
+class _FlagHandler(http.server.BaseHTTPRequestHandler):
+    png = None
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "image/png")
+        self.send_header("Content-Length", str(len(self.png)))
+        self.end_headers()
+        self.wfile.write(self.png)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def bench_flags(codes, repeat, tmp):
+    buf = io.BytesIO()
+    Image.new("RGB", (80, 53), "red").save(buf, format="PNG")
+    _FlagHandler.png = buf.getvalue()
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _FlagHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    url = f"http://127.0.0.1:{server.server_port}/w{{width}}/{{code}}.png"
+    # An empty cache directory, so every new code downloads
+    cache_dir = Path(tmp) / "flags"
+
+    def get(code):
+        return flags.get_flag_image(code, url=url, cache_dir=cache_dir)
+
+    try:
+        codes = list(codes)[:repeat]
+        remaining = iter(codes)
+        cold = _timings(lambda: get(next(remaining)), len(codes))
+        warm = _timings(lambda: get(codes[0]), repeat)
+    finally:
+        server.shutdown()
+    return {"get_flag_image_download": cold, "get_flag_image_cached": warm}
+
+
+def bench_submit_guess(fig, map_layer, world, codes, repeat):
+    """Time AnswerFlow.submit() with the real answer index, without the draw."""
+    answer_index = AnswerIndex(world, codes)
+    max_typos = config.get("quiz", "max_typos", 2)
+    guesses = {
+        "correct": lambda name: name,
+        "typo": lambda name: name[:-2] + name[-1],
+        "wrong": lambda name: "Atlantis",
+    }
+    results = {}
+    for kind, guess_for in guesses.items():
+        answered = 0
+        elapsed = 0.0
+        for seed in range(repeat):
+            # The idle loop is never run, so the map is drawn only once, here
+            flow = _answer_flow(
+                fig,
+                map_layer,
+                ManualLoop(),
+                seed,
+                check=lambda guess, name: answer_index.check(guess, name, max_typos),
+            )
+            start = time.perf_counter()
+            while not flow.quiz.finished:
+                flow.submit(guess_for(flow.quiz.current))
+                answered += 1
+            elapsed += time.perf_counter() - start
+            map_layer.clear()
+        results[f"submit_guess_{kind}"] = {
+            "answers_per_s": answered / elapsed,
+            "us_per_answer": elapsed / answered * 1e6,
+            "answers": answered,
+        }
+    return results
+
+
+def _commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--src", default=BUNDLED_WORLD_PATH)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--output", help="write the JSON here instead of stdout")
+    args = parser.parse_args()
+
+    world = read_geojson(args.src)
+    codes, _ = build_alpha2_table(world)
+    fig, map_layer = make_map(world)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        results.update(bench_world_load(args.src, args.repeat, tmp))
+        results.update(bench_draw_map(fig, map_layer, args.repeat))
+        results.update(bench_answer_render(fig, map_layer, args.repeat))
+        results.update(bench_zoom_and_drag(fig, map_layer, args.repeat))
+        results.update(bench_flags(codes.values(), args.repeat, tmp))
+    results.update(bench_submit_guess(fig, map_layer, world, codes, args.repeat))
+
+    report = {
+        "commit": _commit(),
+        "python": platform.python_version(),
+        "matplotlib": matplotlib.__version__,
+        "repeat": args.repeat,
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
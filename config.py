@@ -0,0 +1,33 @@
+import os
+import tomllib
+from pathlib import Path
+
+
+CONFIG_PATH = Path(__file__).with_name("config.toml")
+
+
+def _load_config():
+    try:
+        with open(CONFIG_PATH, "rb") as f:
+            return tomllib.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+_config = _load_config()
+
+
+def get(section, key, default):
+    """Return a setting from config.toml, or the default if it is not set."""
+    return _config.get(section, {}).get(key, default)
+
+
+def get_cache_dir(*parts):
+    """Return a directory for downloaded data, creating it if needed."""
+    cache_dir = get("cache", "dir", None)
+    if cache_dir is None:
+        base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+        cache_dir = Path(base) / "countries-quiz"
+    cache_dir = Path(cache_dir).expanduser().joinpath(*parts)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir
@@ -0,0 +1 @@
+# Makes pytest put the repository root on sys.path, so tests import the app modules
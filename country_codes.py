@@ -0,0 +1,60 @@
+import pycountry
+
+
+def _column_value(row, column):
+    value = row.get(column)
+    # Natural Earth uses -99 where a country has no official code
+    if not isinstance(value, str) or value in ("", "-99"):
+        return None
+    return value
+
+
+def _resolve_alpha2(row):
+    for column in ("ISO_A2_EH", "ISO_A2"):
+        code = _column_value(row, column)
+        if code and len(code) == 2:
+            return code.lower()
+
+    alpha_3 = _column_value(row, "ADM0_A3")
+    country = pycountry.countries.get(alpha_3=alpha_3) if alpha_3 else None
+    if country is None:
+        try:
+            country = pycountry.countries.lookup(row["NAME"])
+        except LookupError:
+            return None
+    return country.alpha_2.lower()
+
+
+def build_alpha2_table(world):
+    """Map each country NAME in world to its lowercase ISO 3166-1 alpha-2 code.
+
+    Uses the ISO_A2_EH / ISO_A2 / ADM0_A3 columns where the layer has them and
+    falls back to a pycountry lookup by name. Returns the table and the list
+    of names that could not be resolved.
+    """
+    columns = [
+        column
+        for column in ("NAME", "ISO_A2_EH", "ISO_A2", "ADM0_A3")
+        if column in world.columns
+    ]
+    table = {}
+    unresolved = []
+    for row in world[columns].to_dict("records"):
+        name = row["NAME"]
+        if not isinstance(name, str):
+            continue
+        code = _resolve_alpha2(row)
+        if code is None:
+            unresolved.append(name)
+        else:
+            table[name] = code
+    return table, unresolved
+
+
+if __name__ == "__main__":
+    from world_data import load_world
+
+    table, unresolved = build_alpha2_table(load_world())
+    print(f"Resolved {len(table)} country names to ISO codes")
+    for name in unresolved:
+        print(f"  unresolved: {name}")
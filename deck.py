@@ -0,0 +1,38 @@
+import random
+
+
+class Deck:
+    """Items in a shuffled order, dealt one at a time.
+
+    The order is fixed by the seed when the deck is created, so drawing is
+    O(1) and a game can be saved as (seed, position) and restored later
+    from the same items.
+    """
+
+    def __init__(self, items, seed=None):
+        self.seed = random.randrange(2**32) if seed is None else seed
+        self._items = list(items)
+        random.Random(self.seed).shuffle(self._items)
+        self.position = 0
+
+    @property
+    def remaining(self):
+        return len(self._items) - self.position
+
+    def draw(self):
+        """Return the next item. Raises IndexError once the deck is empty."""
+        if self.position >= len(self._items):
+            raise IndexError("draw from an empty deck")
+        item = self._items[self.position]
+        self.position += 1
+        return item
+
+    def state(self):
+        return {"seed": self.seed, "position": self.position}
+
+    @classmethod
+    def restore(cls, items, state):
+        """Recreate a deck saved with state() from the same items."""
+        deck = cls(items, seed=state["seed"])
+        deck.position = state["position"]
+        return deck
@@ -0,0 +1,197 @@
+import io
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+from PIL import Image
+
+import config
+
+
+FLAG_SIZE = (80, 48)
+FLAG_WIDTH = 80
+FLAG_URL = "https://flagcdn.com/w{width}/{code}.png"
+
+_cache_lock = threading.Lock()
+
+
+def _flag_cache_dir(cache_dir=None):
+    if cache_dir is None:
+        return config.get_cache_dir("flags")
+    return Path(cache_dir)
+
+
+def _flag_cache_path(code, width, cache_dir=None):
+    width_dir = _flag_cache_dir(cache_dir) / f"w{width}"
+    width_dir.mkdir(parents=True, exist_ok=True)
+    return width_dir / f"{code}.png"
+
+
+def _evict_flags(max_bytes, cache_dir=None):
+    """Delete least recently used flags until the cache fits in max_bytes."""
+    files = []
+    for width_dir in _flag_cache_dir(cache_dir).iterdir():
+        for path in width_dir.glob("*.png"):
+            stat = path.stat()
+            files.append((stat.st_mtime, stat.st_size, path))
+    total = sum(size for _, size, _ in files)
+    for _, size, path in sorted(files):
+        if total <= max_bytes:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+
+
+def _verify_png(data):
+    """Raise OSError unless data is an intact image, e.g. not an error page."""
+    try:
+        Image.open(io.BytesIO(data)).verify()
+    except SyntaxError as exc:  # PIL's error for a corrupt PNG chunk
+        raise OSError(f"corrupt flag image: {exc}") from exc
+
+
+def fetch_flag_png(code, width=FLAG_WIDTH, url=FLAG_URL, cache_dir=None):
+    """Return the PNG bytes of a flag, from the disk cache when possible.
+
+    code is the lowercase ISO 3166-1 alpha-2 code. url is formatted with
+    width and code; cache_dir defaults to the flags directory of the
+    configured cache. Cache hits are touched so that eviction removes the
+    least recently used flags first. A download that isn't an intact image
+    raises OSError and is not cached.
+    """
+    path = _flag_cache_path(code, width, cache_dir)
+    try:
+        data = path.read_bytes()
+    except FileNotFoundError:
+        pass
+    else:
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass  # evicted by another thread since the read
+        return data
+
+    resp = requests.get(url.format(width=width, code=code), timeout=5)
+    resp.raise_for_status()
+    _verify_png(resp.content)
+    tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+    tmp_path.write_bytes(resp.content)
+    os.replace(tmp_path, path)
+    with _cache_lock:
+        max_bytes = config.get("flags", "cache_max_mb", 20) * 1024 * 1024
+        _evict_flags(max_bytes, cache_dir)
+    return resp.content
+
+
+def placeholder_flag():
+    """Return the blank image shown when a flag is missing or still loading."""
+    return Image.new("RGBA", FLAG_SIZE, (245, 245, 245, 255))
+
+
+def get_flag_image(code, url=FLAG_URL, cache_dir=None):
+    """Return a PIL image of the flag for the given alpha-2 code, or a placeholder if not found."""
+    if code is None:
+        return placeholder_flag()
+    try:
+        data = fetch_flag_png(code, url=url, cache_dir=cache_dir)
+        img = Image.open(io.BytesIO(data)).convert("RGBA")
+        img = img.resize(FLAG_SIZE, Image.Resampling.LANCZOS)
+        return img
+    except Exception:
+        return placeholder_flag()
+
+
+class FlagPrefetcher:
+    """Download flags on worker threads ahead of the moment they are shown.
+
+    Finished images are passed back through a queue, which the Tk loop
+    drains with poll() so that all widget updates stay on the main thread.
+    codes maps country names to alpha-2 codes (see country_codes.py).
+    """
+
+    def __init__(self, codes, max_workers=4):
+        self.codes = codes
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="flag")
+        self._results = queue.Queue()
+        self._images = {}
+        self._pending = set()
+
+    def prefetch(self, country_name):
+        if country_name in self._images or country_name in self._pending:
+            return
+        self._pending.add(country_name)
+        self._executor.submit(self._fetch, country_name)
+
+    def _fetch(self, country_name):
+        code = self.codes.get(country_name)
+        self._results.put((country_name, get_flag_image(code)))
+
+    def poll(self):
+        """Collect finished downloads and return the names of their countries."""
+        arrived = []
+        while True:
+            try:
+                country_name, img = self._results.get_nowait()
+            except queue.Empty:
+                return arrived
+            self._pending.discard(country_name)
+            self._images[country_name] = img
+            arrived.append(country_name)
+
+    def get(self, country_name):
+        """Return the flag if it has arrived, otherwise None."""
+        return self._images.get(country_name)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def prewarm(codes, max_workers=8):
+    """Download the flags for all given alpha-2 codes into the disk cache.
+
+    Returns the codes whose flag could not be fetched or cached.
+    """
+
+    def fetch(code):
+        try:
+            fetch_flag_png(code)
+        except (requests.RequestException, OSError):
+            return code
+        return None
+
+    with ThreadPoolExecutor(max_workers) as executor:
+        return [code for code in executor.map(fetch, codes) if code]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from country_codes import build_alpha2_table
+    from world_data import load_world
+
+    parser = argparse.ArgumentParser(description="Manage the flag image cache.")
+    parser.add_argument(
+        "--prewarm",
+        action="store_true",
+        help="download the flags of every country on the map",
+    )
+    args = parser.parse_args()
+    if args.prewarm:
+        start = time.perf_counter()
+        codes, unresolved = build_alpha2_table(load_world())
+        unique_codes = sorted(set(codes.values()))
+        failed = prewarm(unique_codes)
+        print(
+            f"Cached {len(unique_codes) - len(failed)}/{len(unique_codes)} flags "
+            f"in {time.perf_counter() - start:.1f} s"
+        )
+        for code in failed:
+            print(f"  download failed: {code}")
+        for name in unresolved:
+            print(f"  no ISO code for {name}")
+    else:
+        parser.print_help()
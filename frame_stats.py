@@ -0,0 +1,62 @@
+import csv
+import statistics
+import time
+from collections import deque
+
+
+class FrameStats:
+    """Rolling timings of map draws, for the performance HUD and CSV traces.
+
+    time() runs a draw and records how long it took, at which call site and
+    how many input events it covered. summary() reports on the last window
+    draws. When trace_path is given, that file is replaced with a CSV trace
+    with one row per draw, flushed as it is written so that a crash keeps
+    the rows up to it.
+    """
+
+    def __init__(self, window=240, trace_path=None):
+        self._samples = deque(maxlen=window)
+        self._trace_file = None
+        self._trace = None
+        if trace_path is not None:
+            self._trace_file = open(trace_path, "w", newline="")
+            self._trace = csv.writer(self._trace_file)
+            self._trace.writerow(["time_s", "site", "draw_ms", "events"])
+        self._started = time.perf_counter()
+
+    def time(self, site, draw, events=1):
+        """Run draw() and record its duration under site."""
+        start = time.perf_counter()
+        try:
+            return draw()
+        finally:
+            seconds = time.perf_counter() - start
+            self._samples.append((start, seconds))
+            if self._trace is not None:
+                self._trace.writerow(
+                    [
+                        f"{start - self._started:.4f}",
+                        site,
+                        f"{seconds * 1000:.2f}",
+                        events,
+                    ]
+                )
+                self._trace_file.flush()
+
+    def summary(self):
+        """Return p50/p95/max draw time in ms and draws in the last second."""
+        durations = sorted(seconds * 1000 for _, seconds in self._samples)
+        if not durations:
+            return {"p50": 0.0, "p95": 0.0, "max": 0.0, "per_second": 0}
+        since = time.perf_counter() - 1.0
+        return {
+            "p50": statistics.median(durations),
+            "p95": durations[min(len(durations) - 1, int(len(durations) * 0.95))],
+            "max": durations[-1],
+            "per_second": sum(start >= since for start, _ in self._samples),
+        }
+
+    def close(self):
+        if self._trace_file is not None:
+            self._trace_file.close()
+            self._trace_file = self._trace = None
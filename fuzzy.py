@@ -0,0 +1,69 @@
+def edit_distance(a, b):
+    """Return the number of single-character edits turning a into b.
+
+    Edits are insertions, deletions, substitutions and swaps of two
+    adjacent characters, so "chda" is one edit from "chad".
+    """
+    before = None
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            distance = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b),
+            )
+            if i > 1 and j > 1 and char_a == b[j - 2] and a[i - 2] == char_b:
+                distance = min(distance, before[j - 2] + 1)
+            current.append(distance)
+        before, previous = previous, current
+    return previous[-1]
+
+
+def _trigrams(word):
+    padded = f"  {word} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """Words indexed by their three-letter substrings for near-miss lookups.
+
+    One edit changes at most four of a word's trigrams, so a word within k
+    edits of the query shares all but 4k of the query's trigrams. search()
+    counts shared trigrams through the posting lists and only computes the
+    edit distance for words that pass that count and the length check.
+    """
+
+    def __init__(self, words):
+        self._words = list(dict.fromkeys(words))
+        self._postings = {}
+        for i, word in enumerate(self._words):
+            for trigram in _trigrams(word):
+                self._postings.setdefault(trigram, []).append(i)
+        self.comparisons = 0
+
+    def search(self, word, max_distance):
+        """Return (distance, word) pairs within max_distance, closest first."""
+        trigrams = _trigrams(word)
+        min_shared = len(trigrams) - 4 * max_distance
+        if min_shared > 0:
+            shared = {}
+            for trigram in trigrams:
+                for i in self._postings.get(trigram, ()):
+                    shared[i] = shared.get(i, 0) + 1
+            candidates = [i for i, count in shared.items() if count >= min_shared]
+        else:
+            # Too short for the count to rule anything out
+            candidates = range(len(self._words))
+
+        found = []
+        for i in candidates:
+            candidate = self._words[i]
+            if abs(len(candidate) - len(word)) > max_distance:
+                continue
+            self.comparisons += 1
+            distance = edit_distance(word, candidate)
+            if distance <= max_distance:
+                found.append((distance, candidate))
+        return sorted(found)
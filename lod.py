@@ -0,0 +1,137 @@
+import logging
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+from locator import CountryLocator
+from map_layer import build_country_paths
+from simplify import simplified_paths, tolerance_for
+from world_data import DETAIL_GEOJSON_URLS, build_geometry_index, load_world
+
+
+BASE_LEVEL = "110m"
+
+log = logging.getLogger(__name__)
+
+
+class DetailLevels:
+    """Country paths per Natural Earth scale and simplification tolerance.
+
+    Paths are keyed by (level, tolerance), where tolerance is None for the
+    unsimplified geometry. The unsimplified base level is built at startup;
+    every other key is loaded and simplified on a worker thread the first
+    time it is requested, and poll() hands finished loads over to the Tk
+    loop. thresholds maps each finer level to the screen pixels per degree
+    from which it is used; the full map always uses the base level (still
+    simplified for the zoom).
+    locator_for(key) finds countries in the same geometries the paths of
+    key were built from, so clicks and hovers match what is on screen.
+
+    A level that can't be loaded is skipped from then on. A key that fails
+    to build is not tried again; a simplified key falls back to the
+    unsimplified paths of its level.
+    """
+
+    def __init__(self, base_geometries, thresholds, pixel_tolerance=0.5):
+        self.thresholds = sorted(thresholds.items(), key=lambda item: item[1])
+        self.pixel_tolerance = pixel_tolerance
+        self.base_key = (BASE_LEVEL, None)
+        self._paths = {self.base_key: build_country_paths(base_geometries)}
+        # Only touched by the worker thread after construction
+        self._geometries = {BASE_LEVEL: base_geometries}
+        # Written by the worker before the level's first key is posted
+        self._locators = {BASE_LEVEL: CountryLocator(base_geometries)}
+        self._unavailable = set()
+        self._failed = set()
+        self._loading = set()
+        self._executor = ThreadPoolExecutor(1, thread_name_prefix="lod")
+        self._results = queue.Queue()
+
+    @property
+    def base_paths(self):
+        return self._paths[self.base_key]
+
+    def key_for(self, px_per_degree, full_view=False):
+        """Return the (level, tolerance) to draw at the given zoom.
+
+        full_view is set while the whole map is shown, which always uses
+        the base level, however large the window; it is still simplified
+        for the zoom like any other level.
+        """
+        level = BASE_LEVEL
+        if not full_view:
+            for name, threshold in self.thresholds:
+                if px_per_degree >= threshold and self._available(name):
+                    level = name
+        key = (level, tolerance_for(px_per_degree, self.pixel_tolerance))
+        if key in self._failed:
+            key = (level, None)
+        return key
+
+    def locator_for(self, key):
+        """Return the CountryLocator for a key whose paths have arrived."""
+        return self._locators[key[0]]
+
+    def _available(self, level):
+        return level not in self._unavailable and (level, None) not in self._failed
+
+    def get(self, key):
+        """Return the paths for key, or None while they are being loaded."""
+        paths = self._paths.get(key)
+        if paths is None and key not in self._loading and key not in self._failed:
+            self._loading.add(key)
+            self._executor.submit(self._load, key)
+        return paths
+
+    def _load(self, key):
+        try:
+            paths = self._build(key)
+        except Exception:
+            log.exception("building detail level %s failed", key)
+            self._results.put((key, None, True))
+        else:
+            self._results.put((key, paths, False))
+
+    def _build(self, key):
+        level, tolerance = key
+        geometries = self._geometries.get(level)
+        if geometries is None:
+            world = load_world(DETAIL_GEOJSON_URLS[level], fallback=False)
+            if world is None:
+                return None  # not cached and can't be downloaded
+            geometries = self._geometries[level] = build_geometry_index(world)
+            # Like the paths, fall back to the base geometry for any country
+            # the finer layer names differently
+            self._locators[level] = CountryLocator(
+                {**self._geometries[BASE_LEVEL], **geometries}
+            )
+
+        if tolerance is None:
+            paths = build_country_paths(geometries)
+        else:
+            paths = simplified_paths(geometries, tolerance)
+        # Keep base paths for any country the finer layer names differently
+        return {**self.base_paths, **paths}
+
+    def poll(self):
+        """Collect finished loads and return the keys they were for.
+
+        This includes keys that failed or whose level is unavailable, since
+        key_for() then picks a fallback that should be drawn as well.
+        """
+        finished = []
+        while True:
+            try:
+                key, paths, failed = self._results.get_nowait()
+            except queue.Empty:
+                return finished
+            self._loading.discard(key)
+            if failed:
+                self._failed.add(key)
+            elif paths is None:
+                self._unavailable.add(key[0])
+            else:
+                self._paths[key] = paths
+            finished.append(key)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,140 @@
+import numpy as np
+import shapely
+from matplotlib.collections import PathCollection
+from matplotlib.patches import Patch
+from matplotlib.path import Path
+
+
+LIGHT_GREEN = "#b6eeb7"
+LIGHT_YELLOW = "#fff9b1"
+STATE_COLORS = {"guessed": LIGHT_GREEN, "current": LIGHT_YELLOW}
+
+
+def country_path(geom):
+    """Return one compound path with the exterior and interior rings of geom.
+
+    Vertices and codes come straight from shapely's coordinate arrays. Rings
+    are oriented so that holes wind against their exterior and stay unfilled
+    (e.g. Lesotho inside South Africa).
+    """
+    polygons = shapely.orient_polygons(shapely.get_parts(geom))
+    rings = shapely.get_rings(polygons)
+    vertices = shapely.get_coordinates(rings)
+    counts = shapely.get_num_coordinates(rings)
+    ends = np.cumsum(counts)
+    codes = np.full(len(vertices), Path.LINETO, dtype=Path.code_type)
+    codes[ends - counts] = Path.MOVETO
+    codes[ends - 1] = Path.CLOSEPOLY
+    return Path(vertices, codes)
+
+
+def build_country_paths(geometries):
+    """Map country names to paths, given names mapped to shapely geometries."""
+    return {name: country_path(geom) for name, geom in geometries.items()}
+
+
+class MapLayer:
+    """Country borders and highlights, drawn once and then updated in place.
+
+    paths maps country names to prebuilt paths (see build_country_paths).
+    Borders are one PathCollection over all countries; highlights are a
+    second PathCollection holding just the highlighted paths and a matching
+    facecolor array, so Agg renders every highlight in one collection draw
+    and hidden countries cost nothing.
+
+    Whenever the axes limits change, both collections are cut down to the
+    countries whose bounding box intersects the view, found with an STRtree
+    over the path bounds. drawn and culled count the countries kept and
+    skipped for the current view.
+    """
+
+    def __init__(self, ax, paths):
+        self.ax = ax
+        self._states = {}
+        self._visible = set()
+        self._hits = None
+        self.drawn = 0
+        self.culled = 0
+
+        ax.set_facecolor("#b3d1ff")
+        self.borders = PathCollection(
+            [],
+            facecolors="none",
+            edgecolors="dimgray",
+            linewidths=0.5,
+            zorder=1,
+        )
+        ax.add_collection(self.borders, autolim=False)
+
+        self.highlights = PathCollection([], edgecolors="dimgray", zorder=2)
+        ax.add_collection(self.highlights, autolim=False)
+
+        legend_elements = [
+            Patch(facecolor=LIGHT_YELLOW, label="Current"),
+            Patch(facecolor=LIGHT_GREEN, label="Guessed"),
+        ]
+        ax.legend(handles=legend_elements, loc="lower left")
+
+        self.set_paths(paths)
+        ax.callbacks.connect("xlim_changed", self._on_limits_changed)
+        ax.callbacks.connect("ylim_changed", self._on_limits_changed)
+
+    def set_paths(self, paths):
+        """Swap in paths at another level of detail, keeping the highlights."""
+        self.paths = paths
+        self._names = list(paths)
+        bounds = np.array(
+            [
+                (*path.vertices.min(axis=0), *path.vertices.max(axis=0))
+                for path in paths.values()
+            ]
+        ).reshape(-1, 4)
+        self._tree = shapely.STRtree(shapely.box(*bounds.T))
+        self._hits = None
+        self.cull()
+
+    def _on_limits_changed(self, ax):
+        self.cull()
+
+    def cull(self):
+        """Restrict borders and highlights to the countries inside the view."""
+        (x0, x1), (y0, y1) = self.ax.get_xlim(), self.ax.get_ylim()
+        hits = np.sort(self._tree.query(shapely.box(x0, y0, x1, y1)))
+        self.drawn = len(hits)
+        self.culled = len(self._names) - len(hits)
+        if self._hits is not None and np.array_equal(hits, self._hits):
+            return
+        self._hits = hits
+        names = [self._names[i] for i in hits]
+        self._visible = set(names)
+        self.borders.set_paths([self.paths[name] for name in names])
+        self._update_highlights()
+
+    def get_state(self, name):
+        return self._states.get(name)
+
+    def set_state(self, name, state):
+        """Highlight a country as "current" or "guessed", or clear it with None.
+
+        Returns True if the country's appearance changed.
+        """
+        if name not in self.paths or self._states.get(name) == state:
+            return False
+        if state is None:
+            del self._states[name]
+        else:
+            self._states[name] = state
+        self._update_highlights()
+        return True
+
+    def _update_highlights(self):
+        # Only references are copied here; the paths themselves are prebuilt
+        names = [name for name in self._states if name in self._visible]
+        self.highlights.set_paths([self.paths[name] for name in names])
+        self.highlights.set_facecolor(
+            [STATE_COLORS[self._states[name]] for name in names]
+        )
+
+    def clear(self):
+        self._states.clear()
+        self._update_highlights()
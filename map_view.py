@@ -0,0 +1,112 @@
+class MapView:
+    """Zoom and pan limits of the map axes, kept inside the full map.
+
+    The view never shows more than the full extent given by xlim and ylim,
+    nor zooms in further than MAX_ZOOM times. zoom(), pan() and reset() only
+    set the limits of ax; the caller redraws.
+    """
+
+    MAX_ZOOM = 3.0
+
+    def __init__(self, ax, xlim, ylim):
+        self.ax = ax
+        self.default_xlim = tuple(xlim)
+        self.default_ylim = tuple(ylim)
+
+    @property
+    def zoomed(self):
+        return (
+            self.ax.get_xlim() != self.default_xlim
+            or self.ax.get_ylim() != self.default_ylim
+        )
+
+    def reset(self):
+        """Show the full map."""
+        self._set_limits(self.default_xlim, self.default_ylim)
+
+    def zoom(self, factor, center=None):
+        """Scale the visible range by factor around center (data coordinates).
+
+        center defaults to the middle of the view. Zooming out past the full
+        map shows the full map; zooming in past MAX_ZOOM does nothing.
+        """
+        default_xlim, default_ylim = self.default_xlim, self.default_ylim
+        cur_xlim = self.ax.get_xlim()
+        cur_ylim = self.ax.get_ylim()
+        default_x_range = default_xlim[1] - default_xlim[0]
+        default_y_range = default_ylim[1] - default_ylim[0]
+        aspect = default_y_range / default_x_range
+
+        if center is None:
+            x_center = (cur_xlim[0] + cur_xlim[1]) / 2
+            y_center = (cur_ylim[0] + cur_ylim[1]) / 2
+        else:
+            x_center, y_center = center
+
+        x_range = cur_xlim[1] - cur_xlim[0]
+        new_x_range = x_range * factor
+        new_y_range = new_x_range * aspect
+
+        min_x_range = default_x_range / self.MAX_ZOOM
+        min_y_range = default_y_range / self.MAX_ZOOM
+        if new_x_range < min_x_range or new_y_range < min_y_range:
+            new_xlim = cur_xlim
+            new_ylim = cur_ylim
+        elif new_x_range >= default_x_range or new_y_range >= default_y_range:
+            new_xlim = default_xlim
+            new_ylim = default_ylim
+        else:
+            new_xlim = (x_center - new_x_range / 2, x_center + new_x_range / 2)
+            new_ylim = (y_center - new_y_range / 2, y_center + new_y_range / 2)
+
+            # Shift the view back inside the full map
+            if new_xlim[0] < default_xlim[0]:
+                shift = default_xlim[0] - new_xlim[0]
+                new_xlim = (default_xlim[0], new_xlim[1] + shift)
+            if new_xlim[1] > default_xlim[1]:
+                shift = new_xlim[1] - default_xlim[1]
+                new_xlim = (new_xlim[0] - shift, default_xlim[1])
+            if new_ylim[0] < default_ylim[0]:
+                shift = default_ylim[0] - new_ylim[0]
+                new_ylim = (default_ylim[0], new_ylim[1] + shift)
+            if new_ylim[1] > default_ylim[1]:
+                shift = new_ylim[1] - default_ylim[1]
+                new_ylim = (new_ylim[0] - shift, default_ylim[1])
+
+        self._set_limits(new_xlim, new_ylim)
+
+    def pan(self, start_xlim, start_ylim, delta_x, delta_y):
+        """Move the view that had the start limits by (delta_x, delta_y)."""
+        default_xlim, default_ylim = self.default_xlim, self.default_ylim
+        new_xlim = (start_xlim[0] + delta_x, start_xlim[1] + delta_x)
+        new_ylim = (start_ylim[0] + delta_y, start_ylim[1] + delta_y)
+        x_range = new_xlim[1] - new_xlim[0]
+        y_range = new_ylim[1] - new_ylim[0]
+
+        min_x_range = (default_xlim[1] - default_xlim[0]) / self.MAX_ZOOM
+        min_y_range = (default_ylim[1] - default_ylim[0]) / self.MAX_ZOOM
+        if abs(x_range - min_x_range) < 1e-8 and abs(y_range - min_y_range) < 1e-8:
+            # At maximum zoom the view stays on the centre of the map
+            center_x = (default_xlim[0] + default_xlim[1]) / 2
+            center_y = (default_ylim[0] + default_ylim[1]) / 2
+            new_xlim = (center_x - min_x_range / 2, center_x + min_x_range / 2)
+            new_ylim = (center_y - min_y_range / 2, center_y + min_y_range / 2)
+        else:
+            if new_xlim[0] < default_xlim[0]:
+                new_xlim = (default_xlim[0], default_xlim[0] + x_range)
+            if new_xlim[1] > default_xlim[1]:
+                new_xlim = (default_xlim[1] - x_range, default_xlim[1])
+            if new_ylim[0] < default_ylim[0]:
+                new_ylim = (default_ylim[0], default_ylim[0] + y_range)
+            if new_ylim[1] > default_ylim[1]:
+                new_ylim = (default_ylim[1] - y_range, default_ylim[1])
+
+        self._set_limits(new_xlim, new_ylim)
+
+    def _set_limits(self, xlim, ylim):
+        ax = self.ax
+        ax.set_xlim(xlim)
+        ax.set_ylim(ylim)
+        ax.set_aspect("equal")
+        ax.autoscale(False)
+        ax.margins(0)
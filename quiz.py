@@ -0,0 +1,86 @@
+from deck import Deck
+
+
+# Results of checking a typed guess
+CORRECT = "correct"
+CLOSE = "close"
+WRONG = "wrong"
+
+
+def exact_match(guess, name):
+    """Check a guess by case-insensitive comparison with the name."""
+    return CORRECT if guess.casefold() == name.casefold() else WRONG
+
+
+class QuizEngine:
+    """State and rules of one quiz game, with no GUI or I/O.
+
+    Questions are dealt from a Deck of countries. check(guess, name) returns
+    CORRECT, CLOSE or WRONG; close guesses count as correct when
+    accept_close is set. A front end calls next_question(), answers with
+    answer(), answer_with() or skip(), and shows the returned outcome.
+    Answering once the game is finished raises RuntimeError.
+    """
+
+    def __init__(self, countries, check=exact_match, seed=None, accept_close=True):
+        self.countries = list(countries)
+        self.deck = Deck(self.countries, seed=seed)
+        self.check = check
+        self.accept_close = accept_close
+        self.current = None
+        self.finished = False
+        self.guessed = set()
+        self.answered = 0
+        self.skipped = 0
+
+    @property
+    def score(self):
+        return len(self.guessed)
+
+    @property
+    def total(self):
+        return len(self.countries)
+
+    def next_question(self):
+        """Move to the next country and return it, or None once all are asked."""
+        if self.deck.remaining:
+            self.current = self.deck.draw()
+        else:
+            self.current = None
+            self.finished = True
+        return self.current
+
+    def answer(self, guess):
+        """Answer the current question with a typed guess.
+
+        Returns (correct, close): correct is None if the guess is empty,
+        which skips the question, and close is True for a guess a few typos
+        away from the answer.
+        """
+        self._check_running()
+        guess = guess.strip()
+        if not guess:
+            return self.skip(), False
+        result = self.check(guess, self.current)
+        close = result == CLOSE
+        return self._record(result == CORRECT or close and self.accept_close), close
+
+    def answer_with(self, name):
+        """Answer the current question with a country, e.g. a clicked one."""
+        self._check_running()
+        return self._record(name == self.current)
+
+    def skip(self):
+        self._check_running()
+        self.skipped += 1
+        return None
+
+    def _check_running(self):
+        if self.finished:
+            raise RuntimeError("the quiz is finished")
+
+    def _record(self, correct):
+        self.answered += 1
+        if correct:
+            self.guessed.add(self.current)
+        return correct
@@ -0,0 +1,122 @@
+import time
+
+
+class RedrawScheduler:
+    """Coalesce redraw requests into at most one redraw per frame.
+
+    Mouse events can arrive much faster than the map can be redrawn. Instead
+    of redrawing in every event handler, handlers update the view state and
+    call request(); the latest requested redraw runs once the next frame is
+    due and the ones it replaced are counted as merged. waiting is the number
+    of requests the pending frame will cover, and batch the number the last
+    frame covered.
+    """
+
+    def __init__(self, root, max_fps=60):
+        self.root = root
+        self.frame_interval = 1.0 / max_fps
+        self.requests = 0
+        self.merged = 0
+        self.frames = 0
+        self.waiting = 0
+        self.batch = 0
+        self._redraw = None
+        self._job = None
+        self._last_frame = 0.0
+
+    @property
+    def pending(self):
+        return self._job is not None
+
+    def request(self, redraw):
+        """Run redraw on the next frame, replacing any redraw still pending."""
+        self.requests += 1
+        self.waiting += 1
+        if self._job is not None:
+            self.merged += 1
+            self._redraw = redraw
+            return
+        self._redraw = redraw
+        delay = self._last_frame + self.frame_interval - time.perf_counter()
+        self._job = self.root.after(max(0, round(delay * 1000)), self._run)
+
+    def cancel(self):
+        if self._job is not None:
+            self.root.after_cancel(self._job)
+            self._job = None
+            self._redraw = None
+            self.waiting = 0
+
+    def _run(self):
+        redraw, self._redraw, self._job = self._redraw, None, None
+        self._last_frame = time.perf_counter()
+        self.frames += 1
+        self.batch, self.waiting = self.waiting, 0
+        redraw()
+
+
+class IdleRenderer:
+    """Render at most once per Tk idle cycle, however many changes need it.
+
+    State changes call mark() with the reason they need a new frame instead
+    of drawing themselves. The first mark schedules render(reasons) with
+    after_idle; later marks before it runs are folded into the same render.
+    reasons maps each reason to the number of marks it got.
+    """
+
+    def __init__(self, root, render):
+        self.root = root
+        self.render = render
+        self.marks = 0
+        self.renders = 0
+        self._reasons = {}
+        self._job = None
+
+    @property
+    def dirty(self):
+        return self._job is not None
+
+    def mark(self, reason):
+        self.marks += 1
+        self._reasons[reason] = self._reasons.get(reason, 0) + 1
+        if self._job is None:
+            self._job = self.root.after_idle(self._run)
+
+    def flush(self):
+        """Render now if anything is marked, instead of waiting for idle."""
+        if self._job is not None:
+            self.root.after_cancel(self._job)
+            self._run()
+
+    def _run(self):
+        reasons, self._reasons, self._job = self._reasons, {}, None
+        self.renders += 1
+        self.render(reasons)
+
+
+class ManualLoop:
+    """Stand-in for the after/after_idle queue of a Tk root, run with run().
+
+    Lets RedrawScheduler and IdleRenderer be driven without Tk, e.g. in the
+    tests and benchmarks: run() calls every job queued so far, once.
+    """
+
+    def __init__(self):
+        self._jobs = {}
+        self._next_job = 0
+
+    def after(self, ms, func):
+        self._next_job += 1
+        self._jobs[self._next_job] = func
+        return self._next_job
+
+    def after_idle(self, func):
+        return self.after(0, func)
+
+    def after_cancel(self, job):
+        self._jobs.pop(job, None)
+
+    def run(self):
+        jobs, self._jobs = self._jobs, {}
+        for func in jobs.values():
+            func()
@@ -0,0 +1,86 @@
+import hashlib
+import os
+
+import numpy as np
+import shapely
+from matplotlib.path import Path
+
+import config
+from map_layer import build_country_paths
+
+
+# Tolerances in degrees the map can switch between, coarsest first
+TOLERANCES = (0.5, 0.25, 0.1, 0.05, 0.025, 0.01)
+
+
+def tolerance_for(px_per_degree, pixel_tolerance=0.5):
+    """Return the coarsest tolerance that stays under pixel_tolerance on screen.
+
+    Returns None when even the finest tolerance would be visible.
+    """
+    limit = pixel_tolerance / px_per_degree
+    for tolerance in TOLERANCES:
+        if tolerance <= limit:
+            return tolerance
+    return None
+
+
+def simplify_coverage(geometries, tolerance):
+    """Simplify the countries together so that shared borders stay aligned."""
+    try:
+        return shapely.coverage_simplify(geometries, tolerance)
+    except shapely.errors.GEOSException:
+        # Not a clean coverage (overlapping countries): simplify one by one
+        return shapely.simplify(geometries, tolerance, preserve_topology=True)
+
+
+def _save_paths(cache_path, paths):
+    vertices = [path.vertices for path in paths.values()]
+    tmp_path = cache_path.with_name(f"{cache_path.stem}.tmp.npz")
+    np.savez(
+        tmp_path,
+        names=np.array(list(paths), dtype=str),
+        vertices=np.concatenate(vertices),
+        codes=np.concatenate([path.codes for path in paths.values()]),
+        offsets=np.cumsum([0] + [len(v) for v in vertices]),
+    )
+    os.replace(tmp_path, cache_path)
+
+
+def _load_paths(cache_path):
+    with np.load(cache_path) as data:
+        vertices, codes, offsets = data["vertices"], data["codes"], data["offsets"]
+        return {
+            str(name): Path(vertices[start:end], codes[start:end])
+            for name, start, end in zip(data["names"], offsets[:-1], offsets[1:])
+        }
+
+
+def simplified_paths(geometries, tolerance):
+    """Return country paths simplified to tolerance, cached on disk.
+
+    geometries maps country names to shapely geometries. The cache is keyed
+    by the geometries themselves, so a refreshed map layer gets new entries.
+    """
+    names = list(geometries)
+    geoms = np.array(list(geometries.values()), dtype=object)
+    digest = hashlib.sha1(b"".join(shapely.to_wkb(geoms)))
+    digest.update("\0".join(names).encode())
+    cache_path = config.get_cache_dir("simplified") / (
+        f"{digest.hexdigest()[:16]}-{tolerance}.npz"
+    )
+    try:
+        return _load_paths(cache_path)
+    except (OSError, ValueError, KeyError):
+        pass
+
+    simplified = simplify_coverage(geoms, tolerance)
+    paths = build_country_paths(
+        {
+            name: geom
+            for name, geom in zip(names, simplified)
+            if geom is not None and not geom.is_empty
+        }
+    )
+    _save_paths(cache_path, paths)
+    return paths
@@ -0,0 +1,111 @@
+import io
+
+from PIL import Image, ImageTk
+
+
+class MapSnapshot:
+    """Raster copy of the whole map shown over the canvas while panning.
+
+    The map is rendered once at scale times the screen resolution for the
+    full extent. While panning or zooming, the visible part of that raster
+    is cropped, resized and pasted into a Tk image item on top of the
+    matplotlib canvas, so no polygons are rasterised until the interaction
+    ends and the caller redraws the canvas.
+    """
+
+    def __init__(self, widget, ax, extent, scale=2):
+        self.widget = widget
+        self.ax = ax
+        self.extent = extent
+        self.scale = scale
+        self.active = False
+        self._image = None
+        self._photo = None
+        self._item = None
+
+    def invalidate(self):
+        """Mark the raster as outdated, e.g. after highlights changed."""
+        self._image = None
+
+    def _render(self):
+        ax = self.ax
+        fig = ax.figure
+        xlim, ylim = ax.get_xlim(), ax.get_ylim()
+        legend = ax.get_legend()
+        legend_visible = legend is not None and legend.get_visible()
+        if legend is not None:
+            legend.set_visible(False)
+
+        minx, maxx, miny, maxy = self.extent
+        ax.set_xlim(minx, maxx)
+        ax.set_ylim(miny, maxy)
+        dpi = fig.dpi * self.scale
+        buf = io.BytesIO()
+        fig.savefig(buf, format="rgba", dpi=dpi, facecolor=fig.get_facecolor())
+        x0, y0, x1, y1 = ax.get_position().extents
+
+        ax.set_xlim(xlim)
+        ax.set_ylim(ylim)
+        if legend is not None:
+            legend.set_visible(legend_visible)
+
+        # Take the size from the Agg renderer savefig drew with: it truncates
+        # figsize * dpi, which for fractional scales is often not the rounded
+        # value, and Image.frombytes() needs the exact size
+        height, width = fig.canvas.renderer.buffer_rgba().shape[:2]
+        image = Image.frombytes("RGBA", (width, height), buf.getvalue())
+        # Keep only the axes area, which spans exactly the full extent
+        self._image = image.crop(
+            (
+                round(x0 * width),
+                round((1 - y1) * height),
+                round(x1 * width),
+                round((1 - y0) * height),
+            )
+        ).convert("RGB")
+
+    def _view_box(self):
+        """Return the pixel box of the snapshot covered by the current limits."""
+        minx, maxx, miny, maxy = self.extent
+        width, height = self._image.size
+        (x0, x1), (y0, y1) = self.ax.get_xlim(), self.ax.get_ylim()
+        return (
+            (x0 - minx) / (maxx - minx) * width,
+            (maxy - y1) / (maxy - miny) * height,
+            (x1 - minx) / (maxx - minx) * width,
+            (maxy - y0) / (maxy - miny) * height,
+        )
+
+    def view_image(self, size):
+        """Return the raster for the current view, resized to size pixels."""
+        if self._image is None:
+            self._render()
+        # Nearest-neighbour keeps this at a couple of milliseconds; the sharp
+        # vector map replaces it as soon as the interaction ends
+        return self._image.resize(size, Image.Resampling.NEAREST, box=self._view_box())
+
+    def show(self):
+        """Cover the axes area of the canvas with the raster for the current view."""
+        x0, y0, width, height = self.ax.bbox.bounds
+        size = (max(1, round(width)), max(1, round(height)))
+        view = self.view_image(size)
+
+        if self._photo is None or (self._photo.width(), self._photo.height()) != size:
+            self._photo = ImageTk.PhotoImage(view)
+            if self._item is not None:
+                self.widget.delete(self._item)
+            self._item = self.widget.create_image(0, 0, anchor="nw", image=self._photo)
+        else:
+            self._photo.paste(view)
+
+        top = self.ax.figure.bbox.height - y0 - height
+        self.widget.coords(self._item, round(x0), round(top))
+        self.widget.itemconfigure(self._item, state="normal")
+        self.widget.tag_raise(self._item)
+        self.active = True
+
+    def hide(self):
+        """Remove the raster. The caller redraws the canvas underneath."""
+        if self._item is not None:
+            self.widget.itemconfigure(self._item, state="hidden")
+        self.active = False
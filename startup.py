@@ -0,0 +1,90 @@
+"""Staged startup shared by the launcher (main.py) and the quiz (app.py).
+
+main.py shows the window first and runs load() on a worker thread, so the
+slow imports and the map loading happen behind a progress bar. app.run()
+then builds the quiz on the Tk thread from the root and the loaded data.
+"""
+
+import sys
+import time
+from contextlib import contextmanager
+
+
+# Stages load() goes through, in order
+LOAD_STAGES = ("import", "data load")
+
+
+class StartupProfile:
+    """Wall-clock time spent in each named startup stage."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages = []
+        self.enabled = False
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages.append((name, time.perf_counter() - start))
+
+    def report(self, file=sys.stderr):
+        for name, seconds in self.stages:
+            print(f"{name:>12}  {seconds * 1000:8.1f} ms", file=file)
+        total = time.perf_counter() - self.started
+        print(f"{'total':>12}  {total * 1000:8.1f} ms", file=file)
+
+
+profile = StartupProfile()
+
+
+def load(progress):
+    """Import the heavy modules and load the world data; runs off the Tk thread.
+
+    progress(stage) is called as each of LOAD_STAGES starts. Returns the
+    objects app.run() needs, by name.
+    """
+    progress("import")
+    with profile.stage("import"):
+        # Everything app.py imports at the top, so its imports are free later
+        import matplotlib.pyplot  # noqa: F401
+        from matplotlib.backends import backend_tkagg  # noqa: F401
+        from PIL import ImageTk  # noqa: F401
+
+        import config
+        import flags  # noqa: F401
+        import hover  # noqa: F401
+        import snapshot  # noqa: F401
+        from answers import AnswerIndex, normalize_answer
+        from autocomplete import PrefixIndex
+        from country_codes import build_alpha2_table
+        from lod import DetailLevels
+        from world_data import build_geometry_index, load_world
+
+    progress("data load")
+    with profile.stage("data load"):
+        world = load_world()
+        country_geometries = build_geometry_index(world)
+        country_codes, _ = build_alpha2_table(world)
+        answer_index = AnswerIndex(world, country_codes)
+        return {
+            "world": world,
+            "countries": list(dict.fromkeys(world["NAME"].dropna())),
+            "country_codes": country_codes,
+            "answer_index": answer_index,
+            "name_index": PrefixIndex(
+                answer_index.spellings, normalize=normalize_answer
+            ),
+            # Map paths per Natural Earth scale and simplification tolerance;
+            # finer scales are swapped in when zoomed in far enough
+            "detail_levels": DetailLevels(
+                country_geometries,
+                {
+                    "50m": config.get("map", "lod_50m_px_per_degree", 6),
+                    "10m": config.get("map", "lod_10m_px_per_degree", 12),
+                },
+                pixel_tolerance=config.get("map", "simplify_px", 0.5),
+            ),
+        }
@@ -0,0 +1,124 @@
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt  # noqa: E402
+import pytest  # noqa: E402
+from matplotlib.backends.backend_agg import FigureCanvasAgg  # noqa: E402
+from shapely.geometry import box  # noqa: E402
+
+from answer_flow import AnswerFlow  # noqa: E402
+from frame_stats import FrameStats  # noqa: E402
+from map_layer import MapLayer, build_country_paths  # noqa: E402
+from map_view import MapView  # noqa: E402
+from quiz import QuizEngine  # noqa: E402
+from redraw import ManualLoop, RedrawScheduler  # noqa: E402
+from snapshot import MapSnapshot  # noqa: E402
+
+
+COUNTRIES = {
+    "Westland": box(-180, -60, -60, 60),
+    "Midland": box(-60, -60, 60, 60),
+    "Eastland": box(60, -60, 180, 60),
+}
+
+
+class CountingCanvas(FigureCanvasAgg):
+    def __init__(self, figure):
+        super().__init__(figure)
+        self.draws = 0
+
+    def draw(self):
+        self.draws += 1
+        super().draw()
+
+
+@pytest.fixture
+def root():
+    return ManualLoop()
+
+
+@pytest.fixture
+def flow(root):
+    fig, ax = plt.subplots(figsize=(6, 3), dpi=50)
+    canvas = CountingCanvas(fig)
+    map_layer = MapLayer(ax, build_country_paths(COUNTRIES))
+    view = MapView(ax, (-180, 180), (-60, 60))
+    view.reset()
+    flow = AnswerFlow(
+        root,
+        canvas,
+        QuizEngine(COUNTRIES, seed=1),
+        map_layer,
+        view,
+        MapSnapshot(None, ax, (-180, 180, -60, 60)),
+        RedrawScheduler(root),
+        FrameStats(),
+    )
+    flow.start()
+    yield flow
+    plt.close(fig)
+
+
+def test_start_draws_the_first_question(flow):
+    assert flow.canvas.draws == 1
+    assert flow.map_layer.get_state(flow.quiz.current) == "current"
+
+
+def test_answer_draws_the_map_once(root, flow):
+    asked = flow.quiz.current
+    flow.view.zoom(0.5, center=(0, 0))
+    flow.submit(asked)
+    assert flow.canvas.draws == 1  # nothing is drawn until the Tk loop is idle
+
+    root.run()
+
+    assert flow.canvas.draws == 2
+    assert flow.renderer.renders == 2
+    assert not flow.view.zoomed
+    assert flow.map_layer.get_state(asked) == "guessed"
+    assert flow.map_layer.get_state(flow.quiz.current) == "current"
+
+
+def test_every_answer_draws_once_until_game_over(root, flow):
+    outcomes = []
+    flow.show_outcome = lambda country, correct, close: outcomes.append(correct)
+    flow.show_game_over = lambda: outcomes.append("over")
+
+    flow.submit("Atlantis")
+    root.run()
+    flow.submit("")
+    root.run()
+    flow.answer_with(flow.quiz.current)
+    root.run()
+
+    assert outcomes == [False, None, True, "over"]
+    assert flow.canvas.draws == 1 + 3
+    assert flow.quiz.finished
+
+
+def test_answers_after_game_over_are_ignored(root, flow):
+    while not flow.quiz.finished:
+        flow.answer_with(flow.quiz.current)
+    root.run()
+    outcomes = []
+    flow.show_outcome = lambda country, correct, close: outcomes.append(correct)
+    draws = flow.canvas.draws
+
+    flow.submit("")  # Return in the disabled entry
+    flow.submit("Westland")
+    flow.answer_with("Eastland")
+    root.run()
+
+    assert outcomes == []
+    assert flow.quiz.skipped == 0
+    assert flow.quiz.score == 3
+    assert flow.canvas.draws == draws
+    with pytest.raises(RuntimeError):
+        flow.quiz.answer("")
+
+
+def test_zoom_culls_countries_outside_the_view(flow):
+    assert (flow.map_layer.drawn, flow.map_layer.culled) == (3, 0)
+    flow.view.zoom(0.4, center=(150, 0))
+    assert (flow.map_layer.drawn, flow.map_layer.culled) == (2, 1)
@@ -0,0 +1,107 @@
+import pandas as pd
+import pytest
+
+from answers import AnswerIndex, normalize_answer
+from fuzzy import TrigramIndex, edit_distance
+from quiz import CLOSE, CORRECT, WRONG
+
+
+ALPHA_2 = {
+    "Côte d'Ivoire": "CI",
+    "United States of America": "US",
+    "Czechia": "CZ",
+    "Gambia": "GM",
+    "Tanzania": "TZ",
+    "Kazakhstan": "KZ",
+    "Philippines": "PH",
+    "Chad": "TD",
+    "Iran": "IR",
+    "Iraq": "IQ",
+    "Niger": "NE",
+    "Nigeria": "NG",
+}
+
+LONG_NAMES = {
+    "United States of America": "United States",
+    "Czechia": "Czech Republic",
+    "Gambia": "The Gambia",
+}
+
+
+@pytest.fixture(scope="module")
+def index():
+    world = pd.DataFrame(
+        {
+            "NAME": list(ALPHA_2),
+            "NAME_LONG": [LONG_NAMES.get(name, name) for name in ALPHA_2],
+        }
+    )
+    return AnswerIndex(world, ALPHA_2)
+
+
+def test_normalize_answer():
+    assert normalize_answer("Côte d’Ivoire") == "cote divoire"
+    assert normalize_answer("  COTE D'IVOIRE ") == "cote divoire"
+    assert normalize_answer("Guinea-Bissau") == "guinea bissau"
+    assert normalize_answer("The Gambia") == "gambia"
+    assert normalize_answer("Trinidad & Tobago") == "trinidad and tobago"
+
+
+@pytest.mark.parametrize(
+    "guess, name",
+    [
+        ("Côte d’Ivoire", "Côte d'Ivoire"),
+        ("cote divoire", "Côte d'Ivoire"),
+        ("USA", "United States of America"),
+        ("Czech Republic", "Czechia"),
+        ("the gambia", "Gambia"),
+        ("Tanzania, United Republic of", "Tanzania"),
+        ("United Republic of Tanzania", "Tanzania"),
+    ],
+)
+def test_aliases_and_spellings_are_correct(index, guess, name):
+    assert index.check(guess, name) == CORRECT
+
+
+@pytest.mark.parametrize(
+    "guess, name",
+    [("Kazakstan", "Kazakhstan"), ("Phillipines", "Philippines"), ("Chda", "Chad")],
+)
+def test_typos_are_close(index, guess, name):
+    assert index.check(guess, name, max_typos=2) == CLOSE
+    assert index.check(guess, name, max_typos=0) == WRONG
+
+
+@pytest.mark.parametrize(
+    "guess, name",
+    [
+        ("Iraq", "Iran"),  # spells another country exactly
+        ("Niger", "Nigeria"),
+        ("Irn", "Iran"),  # too short for a typo
+        ("Chadd", "Nigeria"),
+        ("", "Chad"),
+    ],
+)
+def test_other_countries_stay_wrong(index, guess, name):
+    assert index.check(guess, name, max_typos=2) == WRONG
+
+
+def test_edit_distance_counts_swaps_as_one_edit():
+    assert edit_distance("chda", "chad") == 1
+    assert edit_distance("kazakstan", "kazakhstan") == 1
+    assert edit_distance("phillipines", "philippines") == 2
+    assert edit_distance("iran", "iraq") == 1
+    assert edit_distance("", "chad") == 4
+
+
+def test_trigram_search_matches_a_full_scan():
+    words = [normalize_answer(name) for name in (*ALPHA_2, *LONG_NAMES.values())]
+    trigrams = TrigramIndex(words)
+    for query in ("chda", "iraan", "nigr", "kazakstan", "phillipines", "czech rep"):
+        for max_distance in range(4):
+            expected = sorted(
+                (edit_distance(query, word), word)
+                for word in set(words)
+                if edit_distance(query, word) <= max_distance
+            )
+            assert trigrams.search(query, max_distance) == expected
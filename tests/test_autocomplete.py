@@ -0,0 +1,37 @@
+from answers import normalize_answer
+from autocomplete import PrefixIndex
+
+
+SPELLINGS = [
+    ("Denmark", "Denmark"),
+    ("Djibouti", "Djibouti"),
+    ("North Korea", "North Korea"),
+    ("Democratic People's Republic of Korea", "North Korea"),
+    ("Brunei", "Brunei"),
+    ("Brunei Darussalam", "Brunei"),
+    ("Côte d'Ivoire", "Côte d'Ivoire"),
+    ("Mexico", "Mexico"),
+    ("United Mexican States", "Mexico"),
+    ("Uganda", "Uganda"),
+    ("United Kingdom", "United Kingdom"),
+    ("UK", "United Kingdom"),
+]
+
+
+def test_names_rank_ahead_of_aliases():
+    index = PrefixIndex(SPELLINGS, normalize=normalize_answer)
+    assert index.complete("d") == [
+        "Denmark",
+        "Djibouti",
+        "Côte d'Ivoire",
+        "North Korea",
+        "Brunei",
+    ]
+    assert index.complete("u") == ["Uganda", "United Kingdom", "Mexico"]
+
+
+def test_aliases_still_complete():
+    index = PrefixIndex(SPELLINGS, normalize=normalize_answer)
+    assert index.complete("uk") == ["United Kingdom"]
+    assert index.complete("korea") == ["North Korea"]
+    assert index.complete("d", limit=2) == ["Denmark", "Djibouti"]
@@ -0,0 +1,107 @@
+import time
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import geopandas as gpd  # noqa: E402
+import matplotlib.pyplot as plt  # noqa: E402
+from matplotlib.backends.backend_agg import FigureCanvasAgg  # noqa: E402
+from shapely.geometry import box  # noqa: E402
+
+import lod  # noqa: E402
+from hover import HoverOutline  # noqa: E402
+from lod import DetailLevels  # noqa: E402
+from map_layer import MapLayer  # noqa: E402
+
+
+COUNTRIES = {"Westland": box(-180, -60, 0, 60), "Eastland": box(0, -60, 180, 60)}
+
+
+def _wait_for(levels, key):
+    """Request key, poll until its load has finished and return the polled keys."""
+    levels.get(key)
+    finished = []
+    deadline = time.monotonic() + 10
+    while key in levels._loading:
+        assert time.monotonic() < deadline
+        finished.extend(levels.poll())
+        time.sleep(0.01)
+    return finished
+
+
+def test_full_view_stays_on_the_base_level():
+    levels = DetailLevels(COUNTRIES, {"50m": 6, "10m": 12})
+    assert levels.key_for(20, full_view=True) == ("110m", 0.025)
+    assert levels.key_for(2, full_view=True) == ("110m", 0.25)
+    assert levels.key_for(20)[0] == "10m"
+
+
+def test_failed_simplification_falls_back_to_unsimplified_paths(monkeypatch):
+    def fail(geometries, tolerance):
+        raise RuntimeError("simplify failed")
+
+    monkeypatch.setattr(lod, "simplified_paths", fail)
+    levels = DetailLevels(COUNTRIES, {})
+    key = levels.key_for(2)
+    assert key[1] is not None
+
+    assert _wait_for(levels, key) == [key]  # so the fallback gets drawn
+    assert levels.key_for(2) == levels.base_key
+    assert levels.get(key) is None
+    assert key not in levels._loading  # not submitted again
+
+
+def test_unloadable_level_is_skipped(monkeypatch):
+    monkeypatch.setattr(lod, "load_world", lambda url, fallback: None)
+    levels = DetailLevels(COUNTRIES, {"50m": 6})
+    key = levels.key_for(10)
+    assert key[0] == "50m"
+
+    assert _wait_for(levels, key) == [key]
+    assert levels.key_for(10)[0] == "110m"
+
+
+def test_locator_matches_the_level_on_screen(monkeypatch):
+    # An island only the finer layer has, and a border moved east by 1 degree
+    finer = gpd.GeoDataFrame(
+        {"NAME": ["Westland", "Eastland", "Islandia"]},
+        geometry=[box(-180, -60, 1, 60), box(1, -60, 180, 60), box(-30, 70, -29, 71)],
+    )
+    monkeypatch.setattr(lod, "load_world", lambda url, fallback: finer)
+    levels = DetailLevels(COUNTRIES, {"50m": 6})
+    key = ("50m", None)
+
+    _wait_for(levels, key)
+
+    base = levels.locator_for(levels.base_key)
+    assert base.locate(-29.5, 70.5) is None
+    assert base.locate(0.5, 0) == "Eastland"
+    locator = levels.locator_for(key)
+    assert locator.locate(-29.5, 70.5) == "Islandia"
+    assert locator.locate(0.5, 0) == "Westland"
+
+
+def test_hover_drops_a_country_the_new_level_lacks(monkeypatch):
+    finer = gpd.GeoDataFrame(
+        {"NAME": ["Westland", "Eastland", "Islandia"]},
+        geometry=[box(-180, -60, 0, 60), box(0, -60, 180, 60), box(-30, 70, -29, 71)],
+    )
+    monkeypatch.setattr(lod, "load_world", lambda url, fallback: finer)
+    levels = DetailLevels(COUNTRIES, {"50m": 6})
+    key = ("50m", None)
+    _wait_for(levels, key)
+
+    fig, ax = plt.subplots()
+    map_layer = MapLayer(ax, levels.get(key))
+    outline = HoverOutline(FigureCanvasAgg(fig), ax, map_layer, levels.locator_for(key))
+    outline.hover(-29.5, 70.5)
+    assert outline.name == "Islandia"
+
+    map_layer.set_paths(levels.base_paths)
+    outline.set_locator(levels.locator_for(levels.base_key))
+
+    assert outline.name is None
+    outline.hover(-90, 0)
+    assert outline.name == "Westland"
+    plt.close(fig)
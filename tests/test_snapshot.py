@@ -0,0 +1,24 @@
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt  # noqa: E402
+import pytest  # noqa: E402
+
+from snapshot import MapSnapshot  # noqa: E402
+
+
+@pytest.mark.parametrize("scale", [1, 1.5, 2, 2.5])
+@pytest.mark.parametrize("size", [(600, 413), (621, 400), (1151, 647), (1920, 1080)])
+def test_view_image_at_any_window_size_and_scale(size, scale):
+    fig, ax = plt.subplots(dpi=100)
+    fig.subplots_adjust(left=0, right=1, top=1, bottom=0)
+    fig.set_size_inches(size[0] / fig.dpi, size[1] / fig.dpi)
+    ax.set_xlim(-180, 180)
+    ax.set_ylim(-90, 90)
+    snapshot = MapSnapshot(None, ax, (-180, 180, -90, 90), scale=scale)
+
+    assert snapshot.view_image(size).size == size
+    ax.set_xlim(-90, 90)
+    assert snapshot.view_image((300, 200)).size == (300, 200)
+    plt.close(fig)
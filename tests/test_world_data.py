@@ -0,0 +1,67 @@
+import gzip
+import json
+
+import pytest
+import requests
+
+import world_data
+from world_data import (
+    BUNDLED_WORLD_PATH,
+    WORLD_COLUMNS,
+    bundle_world,
+    fetch_world_file,
+    read_geojson,
+)
+
+
+def test_bundled_layer_has_every_world_column():
+    world = read_geojson(BUNDLED_WORLD_PATH)
+    assert list(world.columns) == WORLD_COLUMNS
+    assert world["NAME"].is_unique
+
+
+def test_bundle_rejects_a_layer_without_the_alias_columns(tmp_path):
+    src = tmp_path / "world.geojson"
+    read_geojson(BUNDLED_WORLD_PATH)[["NAME", "geometry"]].to_file(src)
+    with pytest.raises(ValueError, match="NAME_LONG"):
+        bundle_world(src, tmp_path / "bundled.geojson.gz")
+
+
+class _Response:
+    status_code = 200
+    headers = {}
+
+    def __init__(self, content):
+        self.content = content
+
+    def raise_for_status(self):
+        pass
+
+
+@pytest.mark.parametrize("failure", ["unreachable", "captive portal"])
+def test_failed_revalidation_waits_max_age_before_retrying(
+    tmp_path, monkeypatch, failure
+):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    requested = []
+
+    def get(url, headers, timeout):
+        requested.append(url)
+        if len(requested) == 1:
+            return _Response(gzip.decompress(BUNDLED_WORLD_PATH.read_bytes()))
+        if failure == "unreachable":
+            raise requests.ConnectionError("timed out")
+        return _Response(b"<html>Log in to continue</html>")
+
+    monkeypatch.setattr(world_data.requests, "get", get)
+    url = "https://example.com/world.geojson"
+    path = fetch_world_file(url, max_age=60)
+    _, meta_path = world_data._cache_paths(url)
+    meta = json.loads(meta_path.read_text())
+    meta_path.write_text(json.dumps({**meta, "checked_at": 0}))
+
+    # Expired: checked once more, then served from disk until max_age passes
+    assert fetch_world_file(url, max_age=60) == path
+    assert fetch_world_file(url, max_age=60) == path
+    assert len(requested) == 2
+    assert read_geojson(path)["NAME"].is_unique
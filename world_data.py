@@ -0,0 +1,307 @@
+import gzip
+import hashlib
+import importlib.util
+import io
+import json
+import os
+import time
+from pathlib import Path
+
+import geopandas as gpd
+import requests
+import shapely
+
+import config
+
+
+WORLD_GEOJSON_URL = "https://raw.githubusercontent.com/nvkelso/natural-earth-vector/master/geojson/ne_110m_admin_0_countries.geojson"
+# Finer Natural Earth scales, loaded on demand when zooming in
+DETAIL_GEOJSON_URLS = {
+    "50m": "https://raw.githubusercontent.com/nvkelso/natural-earth-vector/master/geojson/ne_50m_admin_0_countries.geojson",
+    "10m": "https://raw.githubusercontent.com/nvkelso/natural-earth-vector/master/geojson/ne_10m_admin_0_countries.geojson",
+}
+BUNDLED_WORLD_PATH = (
+    Path(__file__).parent / "data" / "ne_110m_admin_0_countries.geojson.gz"
+)
+
+# Columns kept in the Feather copy of the world layer
+WORLD_COLUMNS = [
+    "NAME",
+    "NAME_LONG",
+    "NAME_EN",
+    "ABBREV",
+    "ISO_A2_EH",
+    "ISO_A2",
+    "ADM0_A3",
+    "geometry",
+]
+
+# Bump when the layout of the cache directory changes
+CACHE_VERSION = 1
+
+# What the readers raise for a file that isn't a usable world layer
+# (pyogrio raises RuntimeError subclasses, pyarrow ValueError subclasses)
+READ_ERRORS = (OSError, RuntimeError, ValueError)
+
+
+def _cache_paths(url):
+    key = hashlib.sha1(url.encode()).hexdigest()[:16]
+    cache_dir = config.get_cache_dir()
+    return cache_dir / f"world-{key}.geojson", cache_dir / f"world-{key}.json"
+
+
+def _read_meta(meta_path):
+    try:
+        meta = json.loads(meta_path.read_text())
+    except (OSError, ValueError):
+        return None
+    if meta.get("version") != CACHE_VERSION:
+        return None
+    return meta
+
+
+def _write_atomic(path, data):
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+def _drop_cached(url):
+    data_path, meta_path = _cache_paths(url)
+    for path in (data_path, meta_path, _columnar_path(data_path)):
+        path.unlink(missing_ok=True)
+
+
+def _is_world_layer(data):
+    """Check that downloaded bytes parse as a world layer, e.g. not a login page."""
+    try:
+        world = gpd.read_file(io.BytesIO(data))
+    except READ_ERRORS:
+        return False
+    return "NAME" in world.columns and len(world) > 0
+
+
+def _is_valid(data_path, meta):
+    """Check the cached file against the hash recorded when it was downloaded."""
+    try:
+        data = data_path.read_bytes()
+    except OSError:
+        return False
+    return hashlib.sha256(data).hexdigest() == meta.get("sha256")
+
+
+def _mark_checked(data_path, meta_path, meta):
+    """Restart the max_age countdown of a cached copy and return its path.
+
+    Also used after a failed check, so an unreachable server or a captive
+    portal costs one request per max_age rather than one per start.
+    """
+    if meta is None:
+        return None
+    meta["checked_at"] = time.time()
+    try:
+        _write_atomic(meta_path, json.dumps(meta).encode())
+    except OSError:
+        pass  # a read-only cache still serves the copy
+    return data_path
+
+
+def fetch_world_file(url=WORLD_GEOJSON_URL, max_age=None, timeout=None):
+    """Return a local path to the world GeoJSON for url, or None if unavailable.
+
+    A cached copy younger than max_age seconds is used without touching the
+    network. Older copies are revalidated with a conditional request
+    (ETag / Last-Modified), and kept as-is if the server is unreachable or
+    sends something that isn't a world layer; either way the copy is not
+    checked again for another max_age seconds.
+    """
+    if max_age is None:
+        max_age = config.get("world", "cache_max_age_days", 7) * 24 * 3600
+    if timeout is None:
+        timeout = config.get("world", "download_timeout", 10)
+
+    data_path, meta_path = _cache_paths(url)
+    meta = _read_meta(meta_path)
+    if meta is not None and not _is_valid(data_path, meta):
+        meta = None
+
+    if meta is not None and time.time() - meta["checked_at"] < max_age:
+        return data_path
+
+    headers = {}
+    if meta is not None:
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    try:
+        resp = requests.get(url, headers=headers, timeout=timeout)
+        if resp.status_code == 304 and meta is not None:
+            return _mark_checked(data_path, meta_path, meta)
+        resp.raise_for_status()
+    except requests.RequestException:
+        # Offline: a stale copy is better than nothing
+        return _mark_checked(data_path, meta_path, meta)
+    if not _is_world_layer(resp.content):
+        # Treat a body that isn't GeoJSON (captive portal, error page) as offline
+        return _mark_checked(data_path, meta_path, meta)
+
+    _write_atomic(data_path, resp.content)
+    meta = {
+        "version": CACHE_VERSION,
+        "url": url,
+        "etag": resp.headers.get("ETag"),
+        "last_modified": resp.headers.get("Last-Modified"),
+        "sha256": hashlib.sha256(resp.content).hexdigest(),
+        "checked_at": time.time(),
+    }
+    _write_atomic(meta_path, json.dumps(meta).encode())
+    return data_path
+
+
+def _select_columns(world):
+    return world[[column for column in WORLD_COLUMNS if column in world.columns]]
+
+
+def read_geojson(path):
+    """Read a GeoJSON world layer, optionally gzip-compressed."""
+    path = Path(path)
+    if path.suffix == ".gz":
+        return gpd.read_file(io.BytesIO(gzip.decompress(path.read_bytes())))
+    return gpd.read_file(path)
+
+
+def convert_world(src_path, dest_path):
+    """Convert a GeoJSON world layer to a Feather (Arrow IPC) file.
+
+    Geometry is stored as WKB and the CRS in the schema metadata. This skips
+    the GeoParquet metadata handling in geopandas, which costs more than the
+    read itself for a file this small.
+    """
+    import pyarrow as pa
+    import pyarrow.feather as feather
+
+    world = _select_columns(read_geojson(src_path))
+    table = pa.Table.from_pandas(world.drop(columns="geometry"), preserve_index=False)
+    table = table.append_column(
+        "geometry", pa.array(shapely.to_wkb(world.geometry.values), pa.binary())
+    )
+    crs = world.crs.to_string() if world.crs is not None else ""
+    table = table.replace_schema_metadata({"crs": crs})
+    tmp_path = Path(dest_path).with_suffix(".tmp")
+    feather.write_feather(table, tmp_path, compression="uncompressed")
+    os.replace(tmp_path, dest_path)
+
+
+def bundle_world(src_path, dest_path=BUNDLED_WORLD_PATH):
+    """Write a GeoJSON world layer as the gzipped fallback bundled in data/.
+
+    Only WORLD_COLUMNS are kept; a layer missing any of them raises
+    ValueError, so the offline fallback answers like the downloaded layer.
+    """
+    world = read_geojson(src_path)
+    missing = [column for column in WORLD_COLUMNS if column not in world.columns]
+    if missing:
+        raise ValueError(f"world layer lacks columns: {', '.join(missing)}")
+    data = _select_columns(world).to_json(drop_id=True).encode()
+    _write_atomic(Path(dest_path), gzip.compress(data, mtime=0))
+
+
+def read_columnar_world(path):
+    """Read a file written by convert_world into a GeoDataFrame."""
+    import pyarrow.feather as feather
+
+    table = feather.read_table(path, memory_map=True)
+    geometry = shapely.from_wkb(table.column("geometry").to_numpy())
+    crs = table.schema.metadata.get(b"crs", b"").decode() or None
+    return gpd.GeoDataFrame(
+        table.drop_columns("geometry").to_pandas(), geometry=geometry, crs=crs
+    )
+
+
+def _columnar_path(src_path):
+    """Return the Feather path derived from src_path and the kept columns."""
+    key = hashlib.sha1(",".join(WORLD_COLUMNS).encode()).hexdigest()[:8]
+    return config.get_cache_dir() / f"{Path(src_path).name.split('.')[0]}-{key}.feather"
+
+
+def load_columnar_world(src_path):
+    """Load src_path through its Feather copy, converting it first if needed.
+
+    Returns None if pyarrow is not installed.
+    """
+    if importlib.util.find_spec("pyarrow") is None:
+        return None
+
+    dest_path = _columnar_path(src_path)
+    if (
+        not dest_path.exists()
+        or dest_path.stat().st_mtime < Path(src_path).stat().st_mtime
+    ):
+        convert_world(src_path, dest_path)
+    return read_columnar_world(dest_path)
+
+
+def _read_world(path):
+    world = load_columnar_world(path)
+    if world is None:
+        world = _select_columns(read_geojson(path))
+    return world
+
+
+def load_world(url=WORLD_GEOJSON_URL, fallback=True):
+    """Load the world GeoDataFrame from the local cache, refreshing it if stale.
+
+    If url can't be fetched and nothing usable is cached, the bundled 110m
+    layer is returned, or None when fallback is False. A cached copy that
+    fails to load is removed, so the next start downloads or converts it
+    again.
+    """
+    path = fetch_world_file(url)
+    if path is not None:
+        try:
+            return _read_world(path)
+        except READ_ERRORS:
+            _drop_cached(url)
+    if not fallback:
+        return None
+    try:
+        return _read_world(BUNDLED_WORLD_PATH)
+    except READ_ERRORS:
+        # The bundled file ships with the app, so it's the Feather copy in the
+        # cache that is broken; remove it and read the GeoJSON directly
+        _columnar_path(BUNDLED_WORLD_PATH).unlink(missing_ok=True)
+        return _select_columns(read_geojson(BUNDLED_WORLD_PATH))
+
+
+def build_geometry_index(world):
+    """Map each country NAME to its geometry, so lookups don't scan the frame."""
+    index = {}
+    for name, geom in zip(world["NAME"], world.geometry):
+        if not isinstance(name, str) or geom is None or geom.is_empty:
+            continue
+        index[name] = index[name].union(geom) if name in index else geom
+    return index
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Convert a world GeoJSON layer to Feather."
+    )
+    parser.add_argument("src", help="GeoJSON file (optionally .gz)")
+    parser.add_argument("dest", nargs="?", help="Feather file to write")
+    parser.add_argument(
+        "--bundle",
+        action="store_true",
+        help=f"write src to {BUNDLED_WORLD_PATH.name} instead",
+    )
+    args = parser.parse_args()
+    if args.bundle:
+        bundle_world(args.src)
+    elif args.dest:
+        convert_world(args.src, args.dest)
+    else:
+        parser.error("dest is required unless --bundle is given")